@@ -0,0 +1,6 @@
+import sys
+from app.cli import main
+
+# Guarded so worker processes started by "spawn" can import this module
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+import argparse
+import csv
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from app.domain.consolidate import combined_jp, cross_clashes, session_tuples
+from app.domain.recap import recap_rows, wi_names
+from app.domain.schedule import Schedule
+from app.domain.schema import INPUT_HEADERS, format_date, format_time
+from app.storage.project import read_project, BINARY_SUFFIX
+
+
+WI_HEADERS = ["Nama", "JP"]
+CLASH_HEADERS = ["Nama WI", "Tgl", "Proyek 1", "Baris 1", "Jam 1", "Proyek 2", "Baris 2", "Jam 2"]
+
+
+def load_project(path):
+    """Read a project file into (Schedule, WI rows) without Qt.
+
+    The WI JP column is recomputed from the schedule, as the WI table does.
+    """
+    data = read_project(path)
+    models = data["models"]
+    schedule = Schedule(models.get("Input") or [], data["jp_duration"])
+    wi_rows = [[row[0], schedule.total_jp(row[0])] for row in models.get("WI") or []]
+    return schedule, wi_rows
+
+
+def export_sheets(schedule, wi_rows):
+    """The sheets the Export Excel action writes, for `write_workbook`."""
+    columns = range(len(INPUT_HEADERS))
+    names = wi_names(wi_rows)
+    recap = list(recap_rows(schedule.rows, names))
+    return [
+        ("Input", list(INPUT_HEADERS), len(schedule), ([row.text(col) for col in columns] for row in schedule.rows)),
+        ("Rekap", ["Tgl"] + names, len(recap), recap),
+        ("WI", list(WI_HEADERS), len(wi_rows), wi_rows),
+    ]
+
+
+def validate(args):
+    failed = False
+    for path in args.files:
+        schedule, wi_rows = load_project(path)
+        issues = schedule.validate([row[0] for row in wi_rows if row[0]])
+        for i, _, message in issues:
+            print(f"{path}:{i + 1}: {message}")
+        failed = failed or bool(issues)
+    return 1 if failed else 0
+
+
+def recap(args):
+    schedule, wi_rows = load_project(args.file)
+    names = wi_names(wi_rows)
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.writer(out)
+        writer.writerow(["Tgl"] + names)
+        writer.writerows(recap_rows(schedule.rows, names))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def export_path(path, output_dir=None):
+    target = os.path.splitext(path)[0] + ".xlsx"
+    if output_dir:
+        target = os.path.join(output_dir, os.path.basename(target))
+    return target
+
+
+def export_targets(paths, output_dir=None):
+    """Map each project file to its .xlsx target.
+
+    Raises ValueError when files would overwrite each other's workbook,
+    e.g. the same name in two directories under one output directory.
+    """
+    targets = {}
+    owners = {}
+    clashes = []
+    for path in paths:
+        target = targets[path] = export_path(path, output_dir)
+        key = os.path.normcase(os.path.abspath(target))
+        if key in owners:
+            clashes.append(f"{owners[key]} and {path} both export to {target}")
+        else:
+            owners[key] = path
+    if clashes:
+        raise ValueError("conflicting export targets:\n  " + "\n  ".join(clashes))
+    return targets
+
+
+def write_export(target, sheets):
+    # Written aside and moved into place, so a failed export leaves no
+    # half-written workbook behind
+    from app.storage.excel import write_workbook
+
+    tmp_path = target + ".tmp"
+    try:
+        write_workbook(tmp_path, sheets)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def export(args):
+    for path, target in export_targets(args.files, args.output_dir).items():
+        write_export(target, export_sheets(*load_project(path)))
+        print(target)
+    return 0
+
+
+def project_files(patterns):
+    """Expand directories and glob patterns into project file paths."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "*.json")) + glob.glob(os.path.join(pattern, "*" + BINARY_SUFFIX))
+        elif glob.has_magic(pattern):
+            matches = glob.glob(pattern)
+        else:
+            matches = [pattern]
+        paths.extend(sorted(matches))
+    return list(dict.fromkeys(paths))
+
+
+def convert_file(path, target):
+    """Validate one project file and export it; runs in a worker process.
+
+    Returns (path, sessions, issues, target, error) so a bad file is
+    reported in the summary instead of stopping the batch.
+    """
+    try:
+        schedule, wi_rows = load_project(path)
+        issues = schedule.validate([row[0] for row in wi_rows if row[0]])
+        write_export(target, export_sheets(schedule, wi_rows))
+    except Exception as e:  # reported per file
+        return path, 0, [], None, f"{type(e).__name__}: {e}"
+
+    sessions = sum(1 for row in schedule.rows if row.recap_entry() is not None)
+    return path, sessions, issues, target, None
+
+
+def batch(args):
+    paths = project_files(args.paths)
+    if not paths:
+        print("error: no project files found", file=sys.stderr)
+        return 2
+    # Checked up front: workers writing the same workbook would race
+    targets = export_targets(paths, args.output_dir)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    results = []
+    # Whole files are the unit of work: each worker parses, validates and
+    # writes its own workbook, so nothing but the summary crosses processes
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [pool.submit(convert_file, path, target) for path, target in targets.items()]
+        for future in as_completed(futures):
+            path, sessions, issues, target, error = result = future.result()
+            results.append(result)
+            if error:
+                print(f"{path}: FAILED: {error}")
+            else:
+                print(f"{path}: {sessions} sessions, {len(issues)} issues -> {target}")
+            if args.verbose:
+                for i, _, message in issues:
+                    print(f"  {i + 1}: {message}")
+
+    failed = [result for result in results if result[4]]
+    with_issues = [result for result in results if result[2]]
+    print()
+    print(f"Files:          {len(results)}")
+    print(f"Exported:       {len(results) - len(failed)}")
+    print(f"Failed:         {len(failed)}")
+    print(f"With issues:    {len(with_issues)}")
+    print(f"Sessions:       {sum(result[1] for result in results)}")
+    print(f"Issues:         {sum(len(result[2]) for result in results)}")
+    print(f"Time:           {time.perf_counter() - started:.1f} s")
+    for path, _, _, _, error in sorted(failed):
+        print(f"  {path}: {error}")
+    return 1 if failed or with_issues else 0
+
+
+def load_sessions(source, path):
+    """Sessions and JP totals of one project; runs in a worker process."""
+    try:
+        schedule, _ = load_project(path)
+    except Exception as e:  # reported per file
+        return [], {}, f"{type(e).__name__}: {e}"
+    return session_tuples(schedule, source), schedule.jp_totals, None
+
+
+def consolidate(args):
+    paths = project_files(args.paths)
+    if not paths:
+        print("error: no project files found", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    sessions = []
+    totals = []
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for path, (project_sessions, jp_totals, error) in zip(
+            paths, pool.map(load_sessions, range(len(paths)), paths, chunksize=4)
+        ):
+            if error:
+                failed += 1
+                print(f"{path}: FAILED: {error}")
+            sessions.extend(project_sessions)
+            totals.append(jp_totals)
+
+    clashes = cross_clashes(sessions)
+    jp = combined_jp(totals)
+
+    def slot(session):
+        return f"{format_time(session[2])}-{format_time(session[3])}"
+
+    clash_rows = [
+        [a[0], format_date(a[1]), paths[a[4]], a[5] + 1, slot(a), paths[b[4]], b[5] + 1, slot(b)]
+        for a, b in clashes
+    ]
+    jp_rows = [[name, jp[name]] for name in sorted(jp)]
+
+    print(f"Cross-project clashes: {len(clash_rows)}")
+    for name, date, path_a, row_a, slot_a, path_b, row_b, slot_b in clash_rows:
+        print(f"  {name} {date}: {path_a}:{row_a} {slot_a} <-> {path_b}:{row_b} {slot_b}")
+    print()
+    print("Combined JP:")
+    for name, total in jp_rows:
+        print(f"  {name}: {total}")
+    print()
+    print(f"{len(paths)} files, {len(sessions)} sessions, {failed} failed, "
+          f"{time.perf_counter() - started:.1f} s")
+
+    if args.output:
+        from app.storage.excel import write_workbook
+
+        write_workbook(args.output, [
+            ("Bentrok", CLASH_HEADERS, len(clash_rows), clash_rows),
+            ("JP", list(WI_HEADERS), len(jp_rows), jp_rows),
+        ])
+    return 1 if failed or clash_rows else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app", description="WIS scheduling. Without a command, opens the GUI.")
+    commands = parser.add_subparsers(dest="command")
+
+    parser_validate = commands.add_parser("validate", help="report invalid cells, unknown WI and clashes")
+    parser_validate.add_argument("files", nargs="+")
+    parser_validate.set_defaults(run=validate)
+
+    parser_recap = commands.add_parser("recap", help="write the Rekap as CSV")
+    parser_recap.add_argument("file")
+    parser_recap.add_argument("-o", "--output", help="CSV file (default: stdout)")
+    parser_recap.set_defaults(run=recap)
+
+    parser_export = commands.add_parser("export", help="export project files to Excel")
+    parser_export.add_argument("files", nargs="+")
+    parser_export.add_argument("-d", "--output-dir", help="directory for the .xlsx files (default: next to each file)")
+    parser_export.set_defaults(run=export)
+
+    parser_batch = commands.add_parser("batch", help="validate and export many project files in parallel")
+    parser_batch.add_argument("paths", nargs="+", help="project files, directories or glob patterns")
+    parser_batch.add_argument("-d", "--output-dir", help="directory for the .xlsx files (default: next to each file)")
+    parser_batch.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser_batch.add_argument("-v", "--verbose", action="store_true", help="list every issue")
+    parser_batch.set_defaults(run=batch)
+
+    parser_consolidate = commands.add_parser("consolidate", help="find WI clashes across projects and sum their JP")
+    parser_consolidate.add_argument("paths", nargs="+", help="project files, directories or glob patterns")
+    parser_consolidate.add_argument("-o", "--output", help="also write the report to this .xlsx file")
+    parser_consolidate.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser_consolidate.set_defaults(run=consolidate)
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        from app.main import main as run_gui
+        return run_gui()
+
+    try:
+        return args.run(args)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
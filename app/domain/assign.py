@@ -0,0 +1,91 @@
+from bisect import bisect_left, insort
+from app.domain.intervals import IntervalIndex
+
+
+PROGRESS_STEP = 500
+MAX_IMPROVE_PASSES = 10
+
+
+def assign_sessions(rows, loads, progress=None, is_cancelled=None):
+    """Pick a Nama WI for every Input row that has none.
+
+    `rows` is a snapshot of ScheduleRow and `loads` the current (JP, name)
+    of every WI. Sessions are placed longest first on the least loaded WI
+    who is free at that time, then moved from heavier to lighter WIs while
+    that narrows the gap. Rows already naming a WI are never changed.
+
+    Returns (assignments, unplaced): [(row position, name)] and
+    [(row position, reason)]. Returns None when cancelled. Does not touch
+    the rows, so it can run off the GUI thread.
+    """
+    intervals = IntervalIndex()
+    pending = []
+    unplaced = []
+    for i, row in enumerate(rows):
+        if row.name:
+            if row.date is not None and row.end is not None:
+                intervals.add(row, (row.name, row.date), row.start, row.end)
+        elif row.date is None or row.end is None:
+            if row.raw or row.date is not None or row.start is not None or row.jp is not None \
+                    or row.pelatihan or row.agenda:
+                unplaced.append((i, "Tgl/Jam Mulai/JP kosong atau tidak valid."))
+        else:
+            pending.append(i)
+
+    load = {name: jp for jp, name in loads}
+    order = sorted(loads)
+    assigned = {}
+
+    # Greedy: longest sessions first, each to the least loaded free WI
+    pending.sort(key=lambda i: -rows[i].jp)
+    for n, i in enumerate(pending):
+        if n % PROGRESS_STEP == 0:
+            if is_cancelled and is_cancelled():
+                return None
+            if progress:
+                progress(n, len(pending))
+
+        row = rows[i]
+        for jp, name in order:
+            if intervals.find_overlap((name, row.date), row.start, row.end) is None:
+                break
+        else:
+            unplaced.append((i, "Tidak ada WI yang kosong pada waktu ini."))
+            continue
+
+        intervals.add(row, (name, row.date), row.start, row.end)
+        _move_load(order, load, name, row.jp)
+        assigned[i] = name
+
+    # Local search: hand sessions from the most to the least loaded WI
+    # that is free, as long as that lowers the larger of the two loads
+    for _ in range(MAX_IMPROVE_PASSES):
+        if is_cancelled and is_cancelled():
+            return None
+
+        moved = False
+        for i in sorted(assigned, key=lambda i: -load[assigned[i]]):
+            row = rows[i]
+            current = assigned[i]
+            for jp, name in order:
+                if jp + row.jp >= load[current]:
+                    break
+                if name != current and intervals.find_overlap((name, row.date), row.start, row.end) is None:
+                    intervals.add(row, (name, row.date), row.start, row.end)
+                    _move_load(order, load, current, -row.jp)
+                    _move_load(order, load, name, row.jp)
+                    assigned[i] = name
+                    moved = True
+                    break
+        if not moved:
+            break
+
+    if progress:
+        progress(len(pending), len(pending))
+    return sorted(assigned.items()), sorted(unplaced)
+
+
+def _move_load(order, load, name, delta):
+    del order[bisect_left(order, (load[name], name))]
+    load[name] += delta
+    insort(order, (load[name], name))
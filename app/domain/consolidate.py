@@ -0,0 +1,46 @@
+def session_tuples(schedule, source):
+    """(name, date, start, end, source, row position) for every timed
+    session of a Schedule that names a WI."""
+    return [
+        (row.name, row.date, row.start, row.end, source, i)
+        for i, row in enumerate(schedule.rows)
+        if row.name and row.date is not None and row.end is not None
+    ]
+
+
+def cross_clashes(sessions):
+    """Find WIs booked in overlapping sessions of different projects.
+
+    `sessions` are tuples from `session_tuples`, from any number of
+    projects. They are sorted by (name, date, start) and swept once,
+    keeping only the sessions still running at each start. Clashes
+    within a single project are left to Schedule.validate.
+
+    Returns [(a, b)] pairs of session tuples, a starting first.
+    """
+    clashes = []
+    active = []
+    group = None
+    for session in sorted(sessions):
+        name, date, start, end, source, _ = session
+        if (name, date) != group:
+            group = (name, date)
+            active = []
+        else:
+            active = [other for other in active if other[3] > start]
+
+        for other in active:
+            if other[4] != source:
+                clashes.append((other, session))
+        active.append(session)
+    return clashes
+
+
+def combined_jp(totals):
+    """Sum per-project {name: JP} totals into one {name: JP}."""
+    combined = {}
+    for project_totals in totals:
+        for name, jp in project_totals.items():
+            if name:
+                combined[name] = combined.get(name, 0) + jp
+    return combined
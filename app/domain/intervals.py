@@ -0,0 +1,101 @@
+from bisect import bisect_left, insort
+
+
+class IntervalIndex:
+    """Sessions grouped per (Nama WI, Tgl) and kept sorted by start time."""
+
+    def __init__(self):
+        self._buckets = {}  # key -> sorted [(start, end, row_id)]
+        self._entries = {}  # row_id -> (key, entry)
+        self._rows = {}  # row_id -> row
+        self._names_by_date = {}  # Tgl -> Nama WI with sessions that day
+        self._longest = {}  # key -> upper bound on session length in the bucket
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._buckets.clear()
+        self._entries.clear()
+        self._rows.clear()
+        self._names_by_date.clear()
+        self._longest.clear()
+
+    def add(self, row, key, start, end):
+        row_id = id(row)
+        self.discard(row)
+
+        entry = (start, end, row_id)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = []
+            name, date = key
+            self._names_by_date.setdefault(date, set()).add(name)
+        insort(bucket, entry)
+        self._longest[key] = max(self._longest.get(key, 0), end - start)
+        self._entries[row_id] = (key, entry)
+        self._rows[row_id] = row
+
+    def discard(self, row):
+        row_id = id(row)
+        found = self._entries.pop(row_id, None)
+        if found is None:
+            return
+
+        key, entry = found
+        del self._rows[row_id]
+        bucket = self._buckets[key]
+        del bucket[bisect_left(bucket, entry)]
+        if not bucket:
+            del self._buckets[key]
+            self._longest.pop(key, None)
+            name, date = key
+            names = self._names_by_date[date]
+            names.discard(name)
+            if not names:
+                del self._names_by_date[date]
+
+    def find_overlap(self, key, start, end, exclude=None):
+        bucket = self._buckets.get(key)
+        if not bucket:
+            return None
+
+        exclude_id = id(exclude) if exclude is not None else None
+        longest = self._longest[key]
+
+        # Only sessions starting before `end` can overlap; on a clash-free
+        # day the match, if any, is right before the bisect point. Once a
+        # session starts more than the longest session before `start`,
+        # none further back can reach it.
+        pos = bisect_left(bucket, (end,))
+        for i in range(pos - 1, -1, -1):
+            other_start, other_end, row_id = bucket[i]
+            if other_start + longest <= start:
+                break
+            if row_id != exclude_id and other_end > start:
+                return self._rows[row_id]
+        return None
+
+    def busy_names(self, date, start, end, exclude=None):
+        """Nama WI with a session overlapping [start, end) on `date`."""
+        return {
+            name
+            for name in self._names_by_date.get(date, ())
+            if self.find_overlap((name, date), start, end, exclude) is not None
+        }
+
+    def find_clashes(self):
+        """Every pair of overlapping sessions, earlier start first."""
+        clashes = []
+        for bucket in self._buckets.values():
+            if len(bucket) < 2:
+                continue
+
+            # Sweep in start order, keeping the sessions still running
+            active = []
+            for start, end, row_id in bucket:
+                active = [other for other in active if other[0] > start]
+                for _, other_id in active:
+                    clashes.append((self._rows[other_id], self._rows[row_id]))
+                active.append((end, row_id))
+        return clashes
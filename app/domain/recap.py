@@ -0,0 +1,66 @@
+from app.domain.schema import format_date
+
+
+def entry_key(item):
+    start, pelatihan, agenda = item
+    return (start if start is not None else -1, pelatihan, agenda)
+
+
+def wi_names(wi_rows):
+    return sorted({row[0] for row in wi_rows if row[0]})
+
+
+def group_sessions(rows):
+    """Group Rekap entries as {name: {date ordinal: sorted sessions}}."""
+    cells = {}
+    for row in rows:
+        entry = row.recap_entry()
+        if entry is not None:
+            date, name, item = entry
+            cells.setdefault(name, {}).setdefault(date, []).append(item)
+
+    for by_date in cells.values():
+        for items in by_date.values():
+            items.sort(key=entry_key)
+    return cells
+
+
+def format_cell(entries):
+    if not entries:
+        return "-"
+    return " \n".join("| " + pelatihan + " - " + agenda for _, pelatihan, agenda in entries)
+
+
+def recap_table(rows, names):
+    """Return (headers, dates, cells) for the Rekap of `rows`.
+
+    `cells` is sparse: [(row, column, text)] for non-empty cells only, with
+    column 0 being the Tgl column.
+    """
+    grouped = group_sessions(rows)
+    dates = sorted({
+        date
+        for name in names
+        for date in grouped.get(name, {})
+    })
+    row_of = {date: r for r, date in enumerate(dates)}
+
+    cells = []
+    for col, name in enumerate(names, start=1):
+        for date, entries in grouped.get(name, {}).items():
+            cells.append((row_of[date], col, format_cell(entries)))
+    cells.sort()
+    return ["Tgl"] + list(names), dates, cells
+
+
+def recap_rows(rows, names):
+    """Yield the Rekap as full rows of text, Tgl first."""
+    headers, dates, cells = recap_table(rows, names)
+    cells = iter(cells)
+    cell = next(cells, None)
+    for r, date in enumerate(dates):
+        values = [format_date(date)] + ["-"] * (len(headers) - 1)
+        while cell is not None and cell[0] == r:
+            values[cell[1]] = cell[2]
+            cell = next(cells, None)
+        yield values
@@ -0,0 +1,126 @@
+from app.domain.intervals import IntervalIndex
+from app.domain.schema import INPUT_HEADERS, COL_DATE, COL_START, COL_NAME
+
+
+PROGRESS_STEP = 5000
+
+class Schedule:
+    """The Input rows with their clash index and per-WI JP totals.
+
+    Plain Python, so the same rules serve the Input table and headless
+    batch runs. Callers that edit a row update the indexes themselves
+    through `count_jp` and `index_interval`.
+    """
+
+    def __init__(self, rows=None, jp_duration=45):
+        self.rows = []
+        self.jp_duration = jp_duration
+        self.intervals = IntervalIndex()
+        self.jp_totals = {}
+        self.load(rows or [], jp_duration)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def load(self, rows, jp_duration=None):
+        # Rows must already have their end times computed for jp_duration
+        if jp_duration is not None:
+            self.jp_duration = jp_duration
+        self.rows = rows
+        self.rebuild()
+
+    def rebuild(self):
+        self.intervals.clear()
+        self.jp_totals = {}
+        for row in self.rows:
+            self.index_interval(row)
+            self.count_jp(row, 1)
+
+    def set_jp_duration(self, jp_duration):
+        self.jp_duration = jp_duration
+        for row in self.rows:
+            row.update_end(jp_duration)
+        self.intervals.clear()
+        for row in self.rows:
+            self.index_interval(row)
+
+    # --- Indexes ---
+
+    def index_interval(self, row):
+        if not row.name or row.date is None or row.end is None:
+            self.intervals.discard(row)
+        else:
+            self.intervals.add(row, (row.name, row.date), row.start, row.end)
+
+    def count_jp(self, row, sign):
+        if row.jp is None:
+            return
+
+        total = self.jp_totals.get(row.name, 0) + sign * row.jp
+        if total:
+            self.jp_totals[row.name] = total
+        else:
+            self.jp_totals.pop(row.name, None)
+
+    def total_jp(self, name):
+        return self.jp_totals.get(name, 0)
+
+    # --- Rules ---
+
+    def find_clash(self, name, date, start, jp, exclude=None):
+        """The row a session of `name` would overlap, or None."""
+        if not name or date is None or start is None or jp is None:
+            return None
+        return self.intervals.find_overlap((name, date), start, start + jp * self.jp_duration, exclude=exclude)
+
+    def free_instructors(self, date, start, jp, load_order, exclude=None):
+        """Names from `load_order` ((JP, name) pairs) free for a session."""
+        busy = self.intervals.busy_names(date, start, start + jp * self.jp_duration, exclude)
+        return [name for _, name in load_order if name not in busy]
+
+    def find_clashes(self):
+        positions = {id(row): i for i, row in enumerate(self.rows)}
+        return sorted(
+            tuple(sorted((positions[id(a)], positions[id(b)])))
+            for a, b in self.intervals.find_clashes()
+        )
+
+    def validate(self, wi_names=None, progress=None, is_cancelled=None):
+        """Return [(row position, column, message)] for every problem.
+
+        Reports cells that do not parse, Nama WI missing from `wi_names`
+        (when given) and clashing sessions, in row order. Clashes come from
+        the interval index, whose buckets are kept sorted, so the check is
+        one sweep per (Nama WI, Tgl). Returns None when cancelled.
+        """
+        issues = []
+        known = None if wi_names is None else {name.casefold() for name in wi_names}
+        for i, row in enumerate(self.rows):
+            if i % PROGRESS_STEP == 0:
+                if is_cancelled and is_cancelled():
+                    return None
+                if progress:
+                    progress(i, len(self.rows))
+            if row.raw is not None:
+                for col, text in sorted(row.raw.items()):
+                    issues.append((i, col, f"{INPUT_HEADERS[col]} tidak valid: '{text}'."))
+            if known is not None and row.name and row.name.casefold() not in known:
+                issues.append((i, COL_NAME, f"Nama WI '{row.name}' tidak ditemukan di tabel WI."))
+
+        for a, b in self.find_clashes():
+            row = self.rows[b]
+            issues.append((b, COL_START, f"Jadwal bentrok untuk {row.name} pada {row.text(COL_DATE)} (baris {a + 1})!"))
+
+        issues.sort(key=lambda issue: issue[:2])
+        if progress:
+            progress(len(self.rows), len(self.rows))
+        return issues
+
+
+def audit_rows(rows, jp_duration, wi_names=None, progress=None, is_cancelled=None):
+    """Schedule.validate over a snapshot of rows.
+
+    The rows get an index of their own, so this can run off the GUI
+    thread while the table keeps its live one.
+    """
+    return Schedule(list(rows), jp_duration).validate(wi_names, progress, is_cancelled)
@@ -0,0 +1,214 @@
+from datetime import date
+from functools import lru_cache
+
+
+INPUT_HEADERS = [
+    "Tgl/Hari",
+    "Jam Mulai",
+    "JP",
+    "Jam Berakhir",
+    "Pelatihan",
+    "Agenda",
+    "Nama WI"
+]
+COL_DATE, COL_START, COL_JP, COL_END, COL_PELATIHAN, COL_AGENDA, COL_NAME = range(7)
+
+_TIME_TEXT = [f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60)]
+
+
+@lru_cache(maxsize=4096)
+def parse_date(text):
+    """Parse a "dd-mm-yyyy" string into a date ordinal, or None."""
+    parts = str(text).strip().split("-")
+    if len(parts) != 3:
+        return None
+
+    d, m, y = parts
+    if not (0 < len(d) <= 2 and 0 < len(m) <= 2 and len(y) == 4):
+        return None
+    if not (d.isdigit() and m.isdigit() and y.isdigit()):
+        return None
+
+    try:
+        return date(int(y), int(m), int(d)).toordinal()
+    except ValueError:
+        return None
+
+
+def parse_date_range(text):
+    """Parse "dd-mm-yyyy", "mm-yyyy" or "yyyy" into [first, last + 1)
+    date ordinals, or None."""
+    parts = str(text).strip().split("-")
+    if not all(part.isdigit() for part in parts) or len(parts[-1]) != 4:
+        return None
+
+    if len(parts) == 3:
+        first = parse_date(text)
+        return (first, first + 1) if first is not None else None
+
+    y = int(parts[-1])
+    try:
+        if len(parts) == 2:
+            m = int(parts[0])
+            first = date(y, m, 1)
+            last = date(y + 1, 1, 1) if m == 12 else date(y, m + 1, 1)
+        elif len(parts) == 1:
+            first, last = date(y, 1, 1), date(y + 1, 1, 1)
+        else:
+            return None
+    except ValueError:
+        return None
+    return first.toordinal(), last.toordinal()
+
+
+@lru_cache(maxsize=4096)
+def parse_time(text):
+    """Parse a "HH:MM" string into minutes after midnight, or None."""
+    parts = str(text).strip().split(":")
+    if len(parts) != 2:
+        return None
+
+    h, m = parts
+    if not (0 < len(h) <= 2 and 0 < len(m) <= 2):
+        return None
+    if not (h.isdigit() and m.isdigit()):
+        return None
+
+    h, m = int(h), int(m)
+    if h > 23 or m > 59:
+        return None
+    return h * 60 + m
+
+
+def parse_int(text):
+    if isinstance(text, int):
+        return text
+
+    text = str(text).strip()
+    if not text:
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def format_date(ordinal):
+    return date.fromordinal(ordinal).strftime("%d-%m-%Y")
+
+
+def format_time(minutes):
+    return _TIME_TEXT[minutes % len(_TIME_TEXT)]
+
+
+class ScheduleRow:
+    """One Input row, parsed once when written or loaded.
+
+    Tgl, Jam Mulai and JP are kept as a date ordinal, minutes after midnight
+    and an int. Text that does not parse is kept verbatim in `raw` so that
+    loading and saving a hand-edited file stays lossless. `end` caches Jam
+    Berakhir in minutes; it is cleared when Jam Mulai or JP changes and
+    filled in again by `update_end`.
+    """
+
+    __slots__ = ("date", "start", "jp", "end", "pelatihan", "agenda", "name", "raw")
+
+    def __init__(self):
+        self.date = None
+        self.start = None
+        self.jp = None
+        self.end = None
+        self.pelatihan = ""
+        self.agenda = ""
+        self.name = ""
+        self.raw = None
+
+    @classmethod
+    def from_list(cls, values, jp_duration=None):
+        row = cls()
+        for col, value in enumerate(values[:len(INPUT_HEADERS)]):
+            if col != COL_END:
+                row.set_text(col, value)
+        if jp_duration is not None:
+            row.update_end(jp_duration)
+        return row
+
+    def copy(self):
+        row = ScheduleRow.__new__(ScheduleRow)
+        row.date = self.date
+        row.start = self.start
+        row.jp = self.jp
+        row.end = self.end
+        row.pelatihan = self.pelatihan
+        row.agenda = self.agenda
+        row.name = self.name
+        row.raw = dict(self.raw) if self.raw is not None else None
+        return row
+
+    def to_list(self):
+        return [self.text(col) if col != COL_END else "" for col in range(len(INPUT_HEADERS))]
+
+    def update_end(self, jp_duration):
+        if self.start is None or self.jp is None:
+            self.end = None
+        else:
+            self.end = self.start + self.jp * jp_duration
+        return self.end
+
+    def recap_entry(self):
+        if self.date is None or not (self.name and self.pelatihan and self.agenda):
+            return None
+        return self.date, self.name, (self.start, self.pelatihan, self.agenda)
+
+    def text(self, col):
+        if self.raw is not None and col in self.raw:
+            return self.raw[col]
+
+        if col == COL_DATE:
+            return format_date(self.date) if self.date is not None else ""
+        if col == COL_START:
+            return format_time(self.start) if self.start is not None else ""
+        if col == COL_JP:
+            return str(self.jp) if self.jp is not None else ""
+        if col == COL_END:
+            return format_time(self.end) if self.end is not None else ""
+        if col == COL_PELATIHAN:
+            return self.pelatihan
+        if col == COL_AGENDA:
+            return self.agenda
+        if col == COL_NAME:
+            return self.name
+        return ""
+
+    def set_text(self, col, value):
+        value = "" if value is None else value
+
+        if col == COL_DATE:
+            self.date = self._parsed(col, value, parse_date)
+        elif col == COL_START:
+            self.start = self._parsed(col, value, parse_time)
+            self.end = None
+        elif col == COL_JP:
+            self.jp = self._parsed(col, value, parse_int)
+            self.end = None
+        elif col == COL_PELATIHAN:
+            self.pelatihan = str(value)
+        elif col == COL_AGENDA:
+            self.agenda = str(value)
+        elif col == COL_NAME:
+            self.name = str(value)
+
+    def _parsed(self, col, value, parse):
+        parsed = parse(value)
+
+        if self.raw is not None:
+            self.raw.pop(col, None)
+            if not self.raw:
+                self.raw = None
+
+        if parsed is None and str(value).strip():
+            if self.raw is None:
+                self.raw = {}
+            self.raw[col] = str(value)
+        return parsed
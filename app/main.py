@@ -2,7 +2,14 @@ import sys
 from qtpy.QtWidgets import QApplication
 from app.ui.main_window import MainWindow
 
-app = QApplication(sys.argv)
-window = MainWindow()
-window.show()
-sys.exit(app.exec())
+
+def main():
+    app = QApplication(sys.argv)
+    app.setApplicationName("WIS")
+    window = MainWindow()
+    window.show()
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -69,12 +69,24 @@ class PTableModel(QAbstractTableModel):
     def removeRows(self, row, count=1, parent=QModelIndex()):
         self.beginRemoveRows(parent, row, row + count - 1)
 
-        for _ in range(count):
-            del self._data[row]
+        del self._data[row:row + count]
 
         self.endRemoveRows()
         return True
 
+    def insert_records(self, row, records):
+        rows = []
+        for values in records:
+            values = [str(v) for v in values[:len(self.headers)]]
+            rows.append(values + [""] * (len(self.headers) - len(values)))
+
+        if rows:
+            self.beginInsertRows(QModelIndex(), row, row + len(rows) - 1)
+            self._data[row:row] = rows
+            self.endInsertRows()
+
+        return []
+
     def _empty_row(self):
         res = []
         for i in range(0, len(self.headers)):
@@ -84,6 +96,12 @@ class PTableModel(QAbstractTableModel):
     def to_json(self):
         return self._data
 
+    def snapshot(self):
+        return [list(row) for row in self._data]
+
+    def export_snapshot(self):
+        return list(self.headers), len(self._data), [list(row) for row in self._data]
+
     def from_json(self, data):
         self.beginResetModel()
         self._data = data
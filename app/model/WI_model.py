@@ -1,11 +1,14 @@
+from bisect import bisect_left, insort
 from qtpy.QtCore import QAbstractTableModel, Qt, QModelIndex, Signal
+from app.model.batch import ChangeBatcher
 
 
 class WITableModel(QAbstractTableModel):
     nameChanged = Signal(str, str)
     WIChanged = Signal()
+    cellEdited = Signal(int, int, object, object)  # row, column, old, new
 
-    def __init__(self, input_model=None):
+    def __init__(self, input_model=None, batcher=None):
         super().__init__()
 
         # Example domain data (replace later)
@@ -16,6 +19,12 @@ class WITableModel(QAbstractTableModel):
         ]
         self.delegates = {
         }
+        self.input_model = None
+        self.batcher = batcher or ChangeBatcher()
+        self._rows_by_name = {}
+        self._names_by_fold = {}
+        self._by_load = []  # sorted (JP, name) for named rows
+        self._reindex_names()
 
         if input_model:
             self.set_input_model(input_model)
@@ -23,19 +32,95 @@ class WITableModel(QAbstractTableModel):
     def set_input_model(self, input_model):
         self.input_model = input_model
 
-        self.input_model.dataChanged.connect(self.recalculate)
-        self.input_model.rowsInserted.connect(self.recalculate)
-        self.input_model.rowsRemoved.connect(self.recalculate)
+        self.input_model.jpTotalsChanged.connect(self.update_totals)
         self.input_model.modelReset.connect(self.recalculate)
         self.recalculate()
 
     def recalculate(self, *args):
+        if self.input_model is None or not self._data:
+            return
+
         for row in self._data:
             name = row[0]
             row[1] = self.input_model.total_jp_for_name(name)
+        self._rebuild_load_order()
 
-        self.beginResetModel()
-        self.endResetModel()
+        self.dataChanged.emit(self.index(0, 1), self.index(len(self._data) - 1, 1), [Qt.DisplayRole])
+
+    def update_totals(self, names):
+        for name in names:
+            for r in self._rows_by_name.get(name, ()):
+                self._refresh_total(r)
+
+    def _refresh_total(self, r):
+        total = self.input_model.total_jp_for_name(self._data[r][0])
+        if self._data[r][1] != total:
+            self._unrank(self._data[r])
+            self._data[r][1] = total
+            self._rank(self._data[r])
+            index = self.index(r, 1)
+            self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def _flush_changes(self):
+        self.WIChanged.emit()
+
+    def _reindex_names(self):
+        self._rows_by_name = {}
+        self._names_by_fold = {}
+        for r, row in enumerate(self._data):
+            self._index_name(row[0], r)
+        self._rebuild_load_order()
+
+    def _rebuild_load_order(self):
+        self._by_load = sorted(filter(None, map(self._load_key, self._data)))
+
+    @staticmethod
+    def _load_key(row):
+        if not row[0]:
+            return None
+        return (row[1] if isinstance(row[1], int) else 0, row[0])
+
+    def _rank(self, row):
+        key = self._load_key(row)
+        if key is not None:
+            insort(self._by_load, key)
+
+    def _unrank(self, row):
+        key = self._load_key(row)
+        if key is not None:
+            del self._by_load[bisect_left(self._by_load, key)]
+
+    def load_order(self):
+        """(JP, name) of every named WI, lowest JP first."""
+        return self._by_load
+
+    def _index_name(self, name, r):
+        rows = self._rows_by_name.get(name)
+        if rows is None:
+            self._rows_by_name[name] = [r]
+            self._names_by_fold.setdefault(str(name).casefold(), []).append(name)
+        else:
+            insort(rows, r)
+
+    def _unindex_name(self, name, r):
+        rows = self._rows_by_name[name]
+        rows.remove(r)
+        if not rows:
+            del self._rows_by_name[name]
+            fold = str(name).casefold()
+            self._names_by_fold[fold].remove(name)
+            if not self._names_by_fold[fold]:
+                del self._names_by_fold[fold]
+
+    def has_name(self, name):
+        return name in self._rows_by_name
+
+    def resolve_name(self, name):
+        """Return the WI name matching `name`, ignoring case; None if unknown."""
+        if name in self._rows_by_name:
+            return name
+        names = self._names_by_fold.get(str(name).casefold())
+        return names[0] if names else None
 
     def flags(self, index):
         if not index.isValid():
@@ -85,20 +170,31 @@ class WITableModel(QAbstractTableModel):
         if col == 0:  # "Nama" column
             new_name = value
             # Check for duplicates
-            for r in range(self.rowCount()):
-                if r != row and self.data(self.index(r, 0), Qt.EditRole) == new_name:
-                    print(f"Error: Name '{new_name}' already exists.")
-                    return False
+            if any(r != row for r in self._rows_by_name.get(new_name, ())):
+                print(f"Error: Name '{new_name}' already exists.")
+                return False
 
-            old_name = self._data[row][col]
-            if old_name != new_name:
-                self.nameChanged.emit(old_name, new_name)
+        self.restore_cell(row, col, value)
+        return True
 
-        self._data[row][col] = value
-        self.dataChanged.emit(index, index, [role])
-        self.WIChanged.emit()
+    def restore_cell(self, row, col, value):
+        """Set a cell as setData does, without the duplicate-name check."""
+        old = self._data[row][col]
+        if col == 0 and old != value:
+            self.nameChanged.emit(old, value)
 
-        return True
+        self._unrank(self._data[row])
+        self._data[row][col] = value
+        self._rank(self._data[row])
+        if col == 0:
+            self._unindex_name(old, row)
+            self._index_name(value, row)
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index, [Qt.EditRole])
+        self.cellEdited.emit(row, col, old, value)
+        if col == 0 and self.input_model is not None:
+            self._refresh_total(row)
+        self.batcher.defer(self._flush_changes)
 
     def insertRows(self, row, count=1, parent=QModelIndex()):
         self.beginInsertRows(parent, row, row + count - 1)
@@ -106,20 +202,62 @@ class WITableModel(QAbstractTableModel):
         for _ in range(count):
             self._data.insert(row, self._empty_row())
 
-        self.WIChanged.emit()
+        self._reindex_names()
+        self.batcher.defer(self._flush_changes)
         self.endInsertRows()
         return True
 
     def removeRows(self, row, count=1, parent=QModelIndex()):
         self.beginRemoveRows(parent, row, row + count - 1)
 
-        for _ in range(count):
-            del self._data[row]
+        del self._data[row:row + count]
 
-        self.WIChanged.emit()
+        self._reindex_names()
+        self.batcher.defer(self._flush_changes)
         self.endRemoveRows()
         return True
 
+    def insert_records(self, row, records):
+        added = set()
+        accepted = []
+        rejected = []
+        for number, values in enumerate(records, start=1):
+            name = str(values[0]) if values else ""
+            if name and (name in self._rows_by_name or name in added):
+                rejected.append((number, f"Nama WI '{name}' sudah ada."))
+                continue
+
+            added.add(name)
+            jp = self.input_model.total_jp_for_name(name) if self.input_model else ""
+            accepted.append([name, jp])
+
+        if accepted:
+            self.beginInsertRows(QModelIndex(), row, row + len(accepted) - 1)
+            self._data[row:row] = accepted
+            self._reindex_names()
+            self.batcher.defer(self._flush_changes)
+            self.endInsertRows()
+
+        return rejected
+
+    def rows_at(self, first, count):
+        return self._data[first:first + count]
+
+    def restore_rows(self, row, rows):
+        """Put back rows taken out with `rows_at`, without validating them."""
+        self.beginInsertRows(QModelIndex(), row, row + len(rows) - 1)
+        for restored in rows:
+            if self.input_model is not None:
+                restored[1] = self.input_model.total_jp_for_name(restored[0])
+        self._data[row:row] = rows
+        self._reindex_names()
+        self.batcher.defer(self._flush_changes)
+        self.endInsertRows()
+
+    def restore_records(self, row, records):
+        """Insert rows from cell values as they are, without validating them."""
+        self.restore_rows(row, [list(values) for values in records])
+
     def _empty_row(self):
         res = []
         for i in range(0, len(self.headers)):
@@ -129,16 +267,25 @@ class WITableModel(QAbstractTableModel):
     def to_json(self):
         return self._data
 
+    def snapshot(self):
+        return [list(row) for row in self._data]
+
+    def export_snapshot(self):
+        return list(self.headers), len(self._data), [list(row) for row in self._data]
+
     def from_json(self, data):
         self.beginResetModel()
         self._data = data
         if len(data) == 0:
             self._data = [["" for i in range(0, len(self.headers))]]
+        self._reindex_names()
         self.endResetModel()
+        self.recalculate()
         self.WIChanged.emit()
 
     def clear(self):
         self.beginResetModel()
         self._data = [["" for i in range(0, len(self.headers))]]
+        self._reindex_names()
         self.endResetModel()
         self.WIChanged.emit()
@@ -0,0 +1,101 @@
+from qtpy.QtCore import QAbstractTableModel, Qt, QModelIndex
+from app.domain.schema import INPUT_HEADERS, format_date
+
+
+class ArchiveInputModel(QAbstractTableModel):
+    """Read-only Input table over an ArchiveReader.
+
+    Nothing is decoded up front; each cell is read from the memory-mapped
+    columns when the view asks for it.
+    """
+
+    def __init__(self, reader):
+        super().__init__()
+
+        self.reader = reader
+        self.headers = list(INPUT_HEADERS)
+        self.delegates = {
+        }
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self.reader)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.reader.text(index.row(), index.column())
+
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+
+        if orientation == Qt.Horizontal:
+            return self.headers[section]
+
+        return section + 1
+
+    def flags(self, index):
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+    def export_snapshot(self):
+        return list(self.headers), len(self.reader), self.reader.text_rows()
+
+
+class ArchiveRecapModel(QAbstractTableModel):
+    """Read-only Rekap from an archive's precomputed summary block."""
+
+    def __init__(self, summary):
+        super().__init__()
+
+        self.headers = summary["headers"]
+        self._dates = summary["dates"]
+        self._cells = {(r, c): text for r, c, text in summary["cells"]}
+        self.delegates = {
+        }
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self._dates)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._cell_text(index.row(), index.column())
+
+        return None
+
+    def _cell_text(self, row, col):
+        if col == 0:
+            return format_date(self._dates[row])
+        return self._cells.get((row, col), "-")
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+
+        if orientation == Qt.Horizontal:
+            return self.headers[section]
+
+        return section + 1
+
+    def flags(self, index):
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+    def export_snapshot(self):
+        columns = range(len(self.headers))
+        return (
+            list(self.headers),
+            len(self._dates),
+            ([self._cell_text(r, c) for c in columns] for r in range(len(self._dates))),
+        )
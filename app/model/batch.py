@@ -0,0 +1,51 @@
+from contextlib import contextmanager
+from qtpy.QtCore import QObject, QTimer, Signal
+
+
+class ChangeBatcher(QObject):
+    """Coalesces derived-model updates.
+
+    Models record what changed and `defer` a flush callback. Callbacks run
+    once on the next event-loop turn, or when the outermost `batch()` block
+    exits, no matter how many edits happened in between.
+    """
+
+    flushed = Signal()
+
+    def __init__(self):
+        super().__init__()
+
+        self._depth = 0
+        self._pending = {}  # callback -> None, keeps first-deferred order
+        self._scheduled = False
+
+    def defer(self, callback):
+        self._pending[callback] = None
+
+        if self._depth == 0 and not self._scheduled:
+            self._scheduled = True
+            QTimer.singleShot(0, self.flush)
+
+    @contextmanager
+    def batch(self):
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self.flush()
+
+    def flush(self):
+        self._scheduled = False
+        if self._depth > 0 or not self._pending:
+            return
+
+        # Callbacks may defer more work (e.g. WI reacting to Input)
+        while self._pending:
+            callbacks = list(self._pending)
+            self._pending.clear()
+            for callback in callbacks:
+                callback()
+
+        self.flushed.emit()
@@ -0,0 +1,220 @@
+from bisect import bisect_left, bisect_right
+from qtpy.QtCore import QAbstractProxyModel, QModelIndex
+
+
+class InputFilterProxy(QAbstractProxyModel):
+    """Filters Input rows by Nama WI, a Tgl range and free text.
+
+    Filters are answered from column indexes instead of testing every row
+    as QSortFilterProxyModel does: Nama WI -> rows, rows sorted by Tgl, and
+    distinct Pelatihan/Agenda/Nama WI text -> rows. Text search matches the
+    distinct values only, and when the query grows it only rechecks the
+    values the previous query matched. Filters combine by intersection.
+
+    The indexes are built on first use and rebuilt after the source
+    changes. Rows inserted while a filter is active stay visible; edited
+    rows are re-checked on the next filter change.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self._rows = None  # visible source rows in order, None when unfiltered
+        self._proxy_rows = None  # source row -> proxy row, built on demand
+        self._filters = ("", None, "")
+        self._index = None
+        self._text_cache = None  # (query, matching folded values)
+        self._pending = None
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+
+        model.dataChanged.connect(self._on_data_changed)
+        model.rowsAboutToBeInserted.connect(self._on_rows_about_to_be_inserted)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._on_model_reset)
+        model.layoutAboutToBeChanged.connect(lambda *args: self.beginResetModel())
+        model.layoutChanged.connect(lambda *args: self._on_model_reset())
+
+    def is_filtered(self):
+        return self._rows is not None
+
+    def set_filter(self, name="", date_range=None, text=""):
+        """Show rows matching all given filters; empty ones are ignored.
+
+        `name` is a Nama WI (case-insensitive), `date_range` a
+        [first, last) pair of date ordinals and `text` a case-insensitive
+        substring of Pelatihan, Agenda or Nama WI.
+        """
+        filters = (name.strip(), date_range, text.strip())
+        if filters == self._filters:
+            return
+
+        self.beginResetModel()
+        self._filters = filters
+        self._refilter()
+        self.endResetModel()
+
+    # --- QAbstractProxyModel ---
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < self.rowCount() and 0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        if self._rows is None:
+            return self.sourceModel().rowCount()
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        return self.sourceModel().columnCount()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        row = proxy_index.row()
+        if self._rows is not None:
+            row = self._rows[row]
+        return self.sourceModel().index(row, proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = source_index.row()
+        if self._rows is not None:
+            if self._proxy_rows is None:
+                self._proxy_rows = {r: i for i, r in enumerate(self._rows)}
+            row = self._proxy_rows.get(row)
+            if row is None:
+                return QModelIndex()
+        return self.index(row, source_index.column())
+
+    # --- Filtering ---
+
+    def _refilter(self):
+        self._proxy_rows = None
+        name, date_range, text = self._filters
+        if not (name or date_range or text):
+            self._rows = None
+            return
+
+        names, dates, texts = self._build_index()
+        candidates = []
+        if name:
+            candidates.append(names.get(name.casefold(), ()))
+        if date_range:
+            first = bisect_left(dates, (date_range[0],))
+            last = bisect_left(dates, (date_range[1],))
+            candidates.append([r for _, r in dates[first:last]])
+        if text:
+            rows = set()
+            for value in self._matching_text(text, texts):
+                rows.update(texts[value])
+            candidates.append(rows)
+
+        candidates.sort(key=len)
+        rows = set(candidates[0])
+        for other in candidates[1:]:
+            rows.intersection_update(other)
+        self._rows = sorted(rows)
+
+    def _matching_text(self, text, texts):
+        query = text.casefold()
+        values = texts
+        if self._text_cache is not None and query.startswith(self._text_cache[0]):
+            values = self._text_cache[1]
+
+        matches = [value for value in values if query in value]
+        self._text_cache = (query, matches)
+        return matches
+
+    def _build_index(self):
+        if self._index is None:
+            names = {}
+            dates = []
+            texts = {}
+            folded = {}
+            for r, row in enumerate(self.sourceModel().rows_at(0, self.sourceModel().rowCount())):
+                for value in (row.name, row.pelatihan, row.agenda):
+                    if value not in folded:
+                        folded[value] = value.casefold()
+                names.setdefault(folded[row.name], []).append(r)
+                if row.date is not None:
+                    dates.append((row.date, r))
+                for value in {row.name, row.pelatihan, row.agenda}:
+                    if value:
+                        texts.setdefault(folded[value], []).append(r)
+            dates.sort()
+            self._index = (names, dates, texts)
+            self._text_cache = None
+        return self._index
+
+    def _invalidate_index(self):
+        self._index = None
+        self._text_cache = None
+
+    # --- Source changes ---
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        self._invalidate_index()
+        top, bottom = top_left.row(), bottom_right.row()
+        if self._rows is not None:
+            top = bisect_left(self._rows, top)
+            bottom = bisect_right(self._rows, bottom) - 1
+            if top > bottom:
+                return
+        self.dataChanged.emit(
+            self.index(top, top_left.column()),
+            self.index(bottom, bottom_right.column()),
+            list(roles),
+        )
+
+    def _on_rows_about_to_be_inserted(self, parent, first, last):
+        position = first if self._rows is None else bisect_left(self._rows, first)
+        self.beginInsertRows(QModelIndex(), position, position + last - first)
+
+    def _on_rows_inserted(self, parent, first, last):
+        self._invalidate_index()
+        if self._rows is not None:
+            count = last - first + 1
+            position = bisect_left(self._rows, first)
+            self._rows[position:] = [r + count for r in self._rows[position:]]
+            self._rows[position:position] = range(first, last + 1)
+            self._proxy_rows = None
+        self.endInsertRows()
+
+    def _on_rows_about_to_be_removed(self, parent, first, last):
+        if self._rows is None:
+            self._pending = (first, last)
+        else:
+            start, end = bisect_left(self._rows, first), bisect_right(self._rows, last) - 1
+            self._pending = (start, end) if start <= end else None
+        if self._pending is not None:
+            self.beginRemoveRows(QModelIndex(), *self._pending)
+
+    def _on_rows_removed(self, parent, first, last):
+        self._invalidate_index()
+        if self._rows is not None:
+            count = last - first + 1
+            start, end = bisect_left(self._rows, first), bisect_right(self._rows, last)
+            self._rows[start:] = [r - count for r in self._rows[end:]]
+            self._proxy_rows = None
+        if self._pending is not None:
+            self._pending = None
+            self.endRemoveRows()
+
+    def _on_model_reset(self):
+        self._invalidate_index()
+        self._refilter()
+        self.endResetModel()
@@ -1,37 +1,46 @@
 from qtpy.QtCore import QAbstractTableModel, Qt, QModelIndex, Signal
-from datetime import datetime, timedelta
+from app.model.batch import ChangeBatcher
+from app.domain.schedule import Schedule
+from app.domain.schema import (
+    INPUT_HEADERS, COL_DATE, COL_START, COL_JP, COL_END, COL_NAME,
+    ScheduleRow, parse_date, parse_time, parse_int,
+)
 
 
 class InputTableModel(QAbstractTableModel):
     validationFailed = Signal(str)
     inputChanged = Signal()
+    jpTotalsChanged = Signal(list)
+    sessionsChanged = Signal(list, list)
+    cellEdited = Signal(int, int, object, object)  # row, column, old, new
 
-    def __init__(self, jp_duration, wi_model=None):
+    def __init__(self, jp_duration, wi_model=None, batcher=None):
         super().__init__()
 
         self.wi_model = wi_model
-        self.jp_duration = jp_duration
+        self.batcher = batcher or ChangeBatcher()
 
         # Example domain data (replace later)
-        self.headers = [
-                "Tgl/Hari",
-                "Jam Mulai",
-                "JP",
-                "Jam Berakhir",
-                "Pelatihan",
-                "Agenda",
-                "Nama WI"
-        ]
-        self._data = [
-            ["19-10-2026", "14:00", 3, "", "", "Pendidikan Pancasila", "Yeli"],
-            ["15-10-2026", "13:00", 3, "", "", "Pendidikan Kewarganegaraan", "Busur"],
-        ]
+        self.headers = list(INPUT_HEADERS)
+        self.schedule = Schedule([
+            ScheduleRow.from_list(["19-10-2026", "14:00", 3, "", "", "Pendidikan Pancasila", "Yeli"], jp_duration),
+            ScheduleRow.from_list(["15-10-2026", "13:00", 3, "", "", "Pendidikan Kewarganegaraan", "Busur"], jp_duration),
+        ], jp_duration)
         self.delegates = {
             0: "date",
             1: "time",
             2: "int",
             6: "wi"
         }
+        self._reset_pending()
+
+    @property
+    def _data(self):
+        return self.schedule.rows
+
+    @property
+    def jp_duration(self):
+        return self.schedule.jp_duration
 
     def rowCount(self, parent=QModelIndex()):
         return len(self._data)
@@ -43,21 +52,8 @@ class InputTableModel(QAbstractTableModel):
         if not index.isValid():
             return None
 
-        row = index.row()
-        col = index.column()
-
         if role in (Qt.DisplayRole, Qt.EditRole):
-            if col == 3:  # Jam Berakhir
-                jam_mulai_str = self._data[row][1]
-                jp_str = self._data[row][2]
-                try:
-                    jam_mulai = datetime.strptime(jam_mulai_str, "%H:%M")
-                    jp = int(jp_str)
-                    jam_berakhir = jam_mulai + timedelta(minutes=jp * self.jp_duration)
-                    return jam_berakhir.strftime("%H:%M")
-                except (ValueError, TypeError):
-                    return ""
-            return self._data[row][col]
+            return self._data[index.row()].text(index.column())
 
         return None
 
@@ -72,7 +68,7 @@ class InputTableModel(QAbstractTableModel):
 
     def flags(self, index):
         flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
-        if index.column() != 3:  # Make Jam Berakhir not editable
+        if index.column() != COL_END:  # Make Jam Berakhir not editable
             flags |= Qt.ItemIsEditable
         return flags
 
@@ -82,157 +78,281 @@ class InputTableModel(QAbstractTableModel):
 
         row = index.row()
         col = index.column()
-
-        if col == 6 and self.wi_model:  # "Nama WI" column
-            wi_names = [self.wi_model.data(self.wi_model.index(r, 0)) for r in range(self.wi_model.rowCount())]
-            if value not in wi_names:
-                for name in wi_names:
-                    if value.lower() == name.lower():
-                        value = name  # Autocorrect case
-                        break
-                else:
-                    # No case-insensitive match found
-                    self.validationFailed.emit(f"Nama WI '{value}' tidak ditemukan di tabel WI.")
-                    return False
-
+        current = self._data[row]
+
+        if col == COL_NAME and self.wi_model and value:  # "Nama WI" column
+            name = self.wi_model.resolve_name(value)
+            if name is None:
+                # No case-insensitive match found
+                self.validationFailed.emit(f"Nama WI '{value}' tidak ditemukan di tabel WI.")
+                return False
+            value = name  # Autocorrect case
+
+        # Parse once; the parsed value is both validated and stored
+        parsed = None
+        if col == COL_DATE:
+            parsed = parse_date(value)
+        elif col == COL_START:
+            parsed = parse_time(value)
+        elif col == COL_JP:
+            parsed = parse_int(value)
 
         # --- Validation logic starts here ---
-        wi_name = self._data[row][6] if col != 6 else value
-        date_str = self._data[row][0] if col != 0 else value
-        start_time_str = self._data[row][1] if col != 1 else value
-        jp_str = self._data[row][2] if col != 2 else value
-
-        if wi_name and date_str and self.is_time(start_time_str) and self.is_int(jp_str):
-            try:
-                start_time = datetime.strptime(start_time_str, "%H:%M")
-                jp = int(jp_str)
-                end_time = start_time + timedelta(minutes=jp * self.jp_duration)
-
-                for i in range(self.rowCount()):
-                    if i == row:
-                        continue
-
-                    other_wi_name = self._data[i][6]
-                    other_date_str = self._data[i][0]
-
-                    if wi_name == other_wi_name and date_str == other_date_str:
-                        other_start_str = self._data[i][1]
-                        other_jp_str = self._data[i][2]
-
-                        if self.is_time(other_start_str) and self.is_int(other_jp_str):
-                            other_start_time = datetime.strptime(other_start_str, "%H:%M")
-                            other_jp = int(other_jp_str)
-                            other_end_time = other_start_time + timedelta(minutes=other_jp * self.jp_duration)
-
-                            if start_time < other_end_time and other_start_time < end_time:
-                                self.validationFailed.emit(f"Jadwal bentrok untuk {wi_name} pada {date_str}!")
-                                return False
-            except (ValueError, TypeError):
-                pass  # Cannot validate if data is malformed, allow change
-
-        if col == 2 and not self.is_int(value):
-            return False
-        elif col == 1 and not self.is_time(value):
+        wi_name = current.name if col != COL_NAME else value
+        date = current.date if col != COL_DATE else parsed
+        start = current.start if col != COL_START else parsed
+        jp = current.jp if col != COL_JP else parsed
+
+        if self.schedule.find_clash(wi_name, date, start, jp, exclude=current) is not None:
+            date_str = current.text(COL_DATE) if col != COL_DATE else value
+            self.validationFailed.emit(f"Jadwal bentrok untuk {wi_name} pada {date_str}!")
             return False
-        elif col == 0 and not self.is_date(value):
+
+        if col in (COL_DATE, COL_START, COL_JP) and parsed is None and str(value).strip():
             return False
 
-        self._data[row][col] = value
-        self.dataChanged.emit(index, index, [role])
-        self.inputChanged.emit()
+        self.restore_cell(row, col, value)
+        return True
 
-        if col in (1, 2):  # If Jam Mulai or JP changes, update Jam Berakhir
-            jam_berakhir_index = self.index(row, 3)
+    def restore_cell(self, row, col, value):
+        """Set a cell as setData does, without validating the value."""
+        current = self._data[row]
+        if col in (COL_JP, COL_NAME):
+            self._count_jp(current, -1)
+        self._track_session(current, -1)
+
+        old = current.text(col)
+        current.set_text(col, value)
+        if col in (COL_START, COL_JP):
+            current.update_end(self.jp_duration)
+
+        if col in (COL_JP, COL_NAME):
+            self._count_jp(current, 1)
+        self._track_session(current, 1)
+        self.schedule.index_interval(current)
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index, [Qt.EditRole])
+        self.cellEdited.emit(row, col, old, current.text(col))
+        self._defer_flush()
+
+        if col in (COL_START, COL_JP):  # If Jam Mulai or JP changes, update Jam Berakhir
+            jam_berakhir_index = self.index(row, COL_END)
             self.dataChanged.emit(jam_berakhir_index, jam_berakhir_index, [Qt.DisplayRole])
 
-        return True
-
     def insertRows(self, row, count=1, parent=QModelIndex()):
         self.beginInsertRows(parent, row, row + count - 1)
 
-        for _ in range(count):
-            self._data.insert(row, self._empty_row())
+        self._data[row:row] = [self._empty_row() for _ in range(count)]
 
-        self.inputChanged.emit()
+        self._defer_flush()
         self.endInsertRows()
         return True
 
     def removeRows(self, row, count=1, parent=QModelIndex()):
         self.beginRemoveRows(parent, row, row + count - 1)
 
-        for _ in range(count):
-            del self._data[row]
+        for removed in self._data[row:row + count]:
+            self.schedule.intervals.discard(removed)
+            self._count_jp(removed, -1)
+            self._track_session(removed, -1)
+        del self._data[row:row + count]
 
-        self.inputChanged.emit()
+        self._defer_flush()
         self.endRemoveRows()
         return True
 
+    def insert_records(self, row, records):
+        """Validate and insert many rows at once; returns the rejected ones.
+
+        Each record lists cell values in column order (Jam Berakhir is
+        ignored). Rejected records are returned as (record number, message)
+        and reported through a single validationFailed.
+        """
+        accepted = []
+        rejected = []
+        for number, values in enumerate(records, start=1):
+            values = list(values) + [""] * (len(self.headers) - len(values))
+            new_row = ScheduleRow.from_list(values, self.jp_duration)
+
+            if new_row.raw is not None:
+                rejected.append((number, "Format Tgl/Jam Mulai/JP tidak valid."))
+                continue
+
+            if new_row.name and self.wi_model and not self.wi_model.has_name(new_row.name):
+                name = self.wi_model.resolve_name(new_row.name)
+                if name is None:
+                    rejected.append((number, f"Nama WI '{new_row.name}' tidak ditemukan di tabel WI."))
+                    continue
+                new_row.name = name  # Autocorrect case
+
+            # Clashes are checked against the table and earlier records alike
+            clash = self.schedule.find_clash(new_row.name, new_row.date, new_row.start, new_row.jp)
+            if clash is not None:
+                rejected.append((number, f"Jadwal bentrok untuk {new_row.name} pada {new_row.text(COL_DATE)}!"))
+                continue
+            self.schedule.index_interval(new_row)
+
+            accepted.append(new_row)
+
+        if accepted:
+            self.beginInsertRows(QModelIndex(), row, row + len(accepted) - 1)
+            self._data[row:row] = accepted
+            for new_row in accepted:
+                self._count_jp(new_row, 1)
+                self._track_session(new_row, 1)
+            self._defer_flush()
+            self.endInsertRows()
+
+        if rejected:
+            lines = [f"Baris {number}: {message}" for number, message in rejected[:10]]
+            if len(rejected) > 10:
+                lines.append(f"... dan {len(rejected) - 10} baris lainnya")
+            self.validationFailed.emit(
+                f"{len(rejected)} dari {len(accepted) + len(rejected)} baris tidak dimasukkan:\n" + "\n".join(lines)
+            )
+
+        return rejected
+
+    def rows_at(self, first, count):
+        return self._data[first:first + count]
+
+    def restore_rows(self, row, rows):
+        """Put back rows taken out with `rows_at`, without validating them."""
+        self.beginInsertRows(QModelIndex(), row, row + len(rows) - 1)
+        self._data[row:row] = rows
+        for restored in rows:
+            restored.update_end(self.jp_duration)
+            self.schedule.index_interval(restored)
+            self._count_jp(restored, 1)
+            self._track_session(restored, 1)
+        self._defer_flush()
+        self.endInsertRows()
+
+    def restore_records(self, row, records):
+        """Insert rows from cell values as they are, without validating them."""
+        self.restore_rows(row, [ScheduleRow.from_list(values, self.jp_duration) for values in records])
+
     def _empty_row(self):
-        res = []
-        for i in range(0, len(self.headers)):
-            res.append("")
-        return res
+        return ScheduleRow()
 
     def to_json(self):
-        return self._data
+        return [row.to_list() for row in self._data]
+
+    def export_snapshot(self):
+        rows = self.snapshot()
+        columns = range(len(self.headers))
+        return (
+            list(self.headers),
+            len(rows),
+            ([row.text(col) for col in columns] for row in rows),
+        )
+
+    def snapshot(self):
+        # Copies, so workers never read rows the GUI may still be editing
+        return [row.copy() for row in self._data]
+
+    def schedule_row(self, r):
+        return self._data[r]
 
     def from_json(self, data):
+        self.load_rows([ScheduleRow.from_list(values, self.jp_duration) for values in data])
+
+    def load_rows(self, rows, jp_duration=None):
+        # Rows must already have their end times computed for jp_duration
         self.beginResetModel()
-        self._data = data
-        if len(self._data) == 0:
-            self._data = [["" for _ in range(len(self.headers))]]
+        self.schedule.load(rows or [self._empty_row()], jp_duration)
+        self._reset_pending()
         self.inputChanged.emit()
         self.endResetModel()
 
     def clear(self):
         self.beginResetModel()
-        self._data = [["" for i in range(0, len(self.headers))]]
+        self.schedule.load([self._empty_row()])
+        self._reset_pending()
         self.inputChanged.emit()
         self.endResetModel()
 
     def set_jp_duration(self, jp_duration):
-        self.jp_duration = jp_duration
+        self.schedule.set_jp_duration(jp_duration)
         # Trigger update for the whole Jam Berakhir column
-        self.dataChanged.emit(self.index(0, 3), self.index(self.rowCount() - 1, 3))
+        self.dataChanged.emit(self.index(0, COL_END), self.index(self.rowCount() - 1, COL_END))
 
     def is_date(self, text: str) -> bool:
-        text = text.strip()
-        try:
-            # adjust format if needed
-            datetime.strptime(text, "%d-%m-%Y")
-            return True
-        except ValueError:
-            return False
+        return parse_date(text) is not None
 
     def is_time(self, text: str) -> bool:
-        text = text.strip()
-        try:
-            datetime.strptime(text, "%H:%M")
-            return True
-        except ValueError:
-            return False
+        return parse_time(text) is not None
 
     def is_int(self, text: str) -> bool:
-        text = text.strip()
-        if not text:
-            return False
-        try:
-            int(text)
-            return True
-        except ValueError:
-            return False
+        return parse_int(text) is not None
 
     def total_jp_for_name(self, name: str) -> int:
-        total = 0
-        for row in self._data:
-            if row[6] == name:
-                if self.is_int(str(row[2])):
-                    total += int(row[2])
-        return total
+        return self.schedule.total_jp(name)
 
     def update_wi_name(self, old_name, new_name):
         for i, row in enumerate(self._data):
-            if row[6] == old_name:
-                self._data[i][6] = new_name
-                index = self.index(i, 6)
-                self.dataChanged.emit(index, index, [Qt.EditRole])
+            if row.name == old_name:
+                self._count_jp(row, -1)
+                self._track_session(row, -1)
+                row.name = new_name
+                self._count_jp(row, 1)
+                self._track_session(row, 1)
+                self.schedule.index_interval(row)
+                index = self.index(i, COL_NAME)
+                self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+        self._defer_flush()
+
+    def _count_jp(self, row, sign):
+        if row.jp is not None:
+            self.schedule.count_jp(row, sign)
+            self._pending_names.add(row.name)
+
+    def _track_session(self, row, sign):
+        entry = row.recap_entry()
+        if entry is None:
+            return
+
+        count = self._pending_sessions.get(entry, 0) + sign
+        if count:
+            self._pending_sessions[entry] = count
+        else:
+            del self._pending_sessions[entry]
+
+    def _reset_pending(self):
+        self._pending_names = set()
+        self._pending_sessions = {}  # recap entry -> net added count
+
+    def _defer_flush(self):
+        self.batcher.defer(self._flush_changes)
+
+    def _flush_changes(self):
+        names = sorted(self._pending_names)
+        removed = []
+        added = []
+        for entry, count in self._pending_sessions.items():
+            if count < 0:
+                removed.extend([entry] * -count)
+            else:
+                added.extend([entry] * count)
+        self._reset_pending()
+
+        if names:
+            self.jpTotalsChanged.emit(names)
+        if removed or added:
+            self.sessionsChanged.emit(removed, added)
+        self.inputChanged.emit()
+
+    def free_instructors(self, date, start, jp, exclude=None):
+        """WI names free for a session, lowest total JP first.
+
+        `date` is an ordinal and `start` minutes, as parsed by the schema;
+        `exclude` is the row being edited, whose own slot does not count.
+        """
+        if self.wi_model is None:
+            return []
+
+        return self.schedule.free_instructors(date, start, jp, self.wi_model.load_order(), exclude)
+
+    def find_clashes(self):
+        return self.schedule.find_clashes()
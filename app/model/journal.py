@@ -0,0 +1,83 @@
+from qtpy.QtCore import QObject, Qt, QModelIndex
+
+
+class JournalRecorder(QObject):
+    """Logs user edits on the editable models into a Journal.
+
+    Only changes announced with Qt.EditRole on editable cells are logged;
+    derived updates (Jam Berakhir, JP totals, WI renames propagated to
+    Input) are announced with Qt.DisplayRole and are recomputed on replay.
+    Resets are not logged: loading or clearing starts a new journal.
+    """
+
+    def __init__(self, journal, models):
+        super().__init__()
+
+        self.journal = journal
+        self.models = models
+
+        for name, model in models.items():
+            model.dataChanged.connect(
+                lambda top_left, bottom_right, roles=(), name=name:
+                    self._on_data_changed(name, top_left, bottom_right, roles)
+            )
+            model.rowsInserted.connect(
+                lambda parent, first, last, name=name: self._on_rows_inserted(name, first, last)
+            )
+            model.rowsRemoved.connect(
+                lambda parent, first, last, name=name: self._on_rows_removed(name, first, last)
+            )
+
+    def _on_data_changed(self, name, top_left, bottom_right, roles):
+        if Qt.EditRole not in roles:
+            return
+
+        model = self.models[name]
+        for r in range(top_left.row(), bottom_right.row() + 1):
+            for c in range(top_left.column(), bottom_right.column() + 1):
+                index = model.index(r, c)
+                if model.flags(index) & Qt.ItemIsEditable:
+                    self.journal.append({
+                        "op": "set", "model": name, "row": r, "col": c,
+                        "value": model.data(index, Qt.EditRole),
+                    })
+
+    def _on_rows_inserted(self, name, first, last):
+        model = self.models[name]
+        columns = range(model.columnCount())
+        rows = [
+            [model.data(model.index(r, c), Qt.EditRole) for c in columns]
+            for r in range(first, last + 1)
+        ]
+        self.journal.append({"op": "insert", "model": name, "row": first, "rows": rows})
+
+    def _on_rows_removed(self, name, first, last):
+        self.journal.append({"op": "remove", "model": name, "row": first, "count": last - first + 1})
+
+    def apply(self, record):
+        """Replay one logged edit; returns False if the model rejected it."""
+        model = self.models.get(record.get("model"))
+        if model is None:
+            return False
+
+        op = record["op"]
+        row = record["row"]
+        if op == "set":
+            # Like inserts, cells may have been restored live without validation
+            index = model.index(row, record["col"])
+            if not index.isValid() or not model.flags(index) & Qt.ItemIsEditable:
+                return False
+            model.restore_cell(row, record["col"], record["value"])
+            return True
+        if op == "insert":
+            # Inserted rows were accepted live (undo restores rows without
+            # validating them), so they are put back as they were
+            rows = record["rows"]
+            if not rows or not 0 <= row <= model.rowCount():
+                return False
+            model.restore_records(row, rows)
+            return True
+        if op == "remove":
+            count = record["count"]
+            return 0 <= row and row + count <= model.rowCount() and model.removeRows(row, count, QModelIndex())
+        return False
@@ -1,20 +1,31 @@
+from bisect import bisect_left, insort
 from qtpy.QtCore import QAbstractTableModel, Qt, QModelIndex
-from datetime import datetime
+from app.domain.schema import format_date
+from app.domain.recap import entry_key, format_cell, group_sessions, wi_names
 
 
 class RecapTableModel(QAbstractTableModel):
+    """Live Tgl x Nama WI pivot of the Input sessions.
+
+    Sessions are kept per name and date for every name, so WI rows being
+    added or renamed only insert or remove a column. Only names present in
+    the WI table are shown, and only dates with at least one shown session
+    get a row.
+    """
+
     def __init__(self):
         super().__init__()
 
-        # Example domain data (replace later)
-        self.headers = ["-"]
-        self._data = [
-        ]
+        self.headers = ["Tgl"]
+        self._names = []
+        self._dates = []
+        self._cells = {}  # name -> {date ordinal -> sorted [(start, pelatihan, agenda)]}
+        self._date_counts = {}  # date ordinal -> sessions in shown columns
         self.delegates = {
         }
 
     def rowCount(self, parent=QModelIndex()):
-        return len(self._data)
+        return len(self._dates)
 
     def columnCount(self, parent=QModelIndex()):
         return len(self.headers)
@@ -23,13 +34,17 @@ class RecapTableModel(QAbstractTableModel):
         if not index.isValid():
             return None
 
-        value = self._data[index.row()][index.column()]
-
         if role in (Qt.DisplayRole, Qt.EditRole):
-            return value
+            date = self._dates[index.row()]
+            if index.column() == 0:
+                return format_date(date)
+            return self._cell_text(self._names[index.column() - 1], date)
 
         return None
 
+    def _cell_text(self, name, date):
+        return format_cell(self._cells.get(name, {}).get(date))
+
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role != Qt.DisplayRole:
             return None
@@ -42,83 +57,131 @@ class RecapTableModel(QAbstractTableModel):
     def flags(self, index):
         return Qt.ItemIsSelectable | Qt.ItemIsEnabled
 
-    def _empty_row(self):
-        res = []
-        for i in range(0, len(self.headers)):
-            res.append("")
-        return res
-
     def to_json(self):
         pass
 
+    def snapshot(self):
+        return None
+
+    def export_snapshot(self):
+        # Cell lists are frozen here, on the GUI thread; the text is built
+        # from the frozen copy by the export worker
+        dates = list(self._dates)
+        names = list(self._names)
+        cells = {
+            name: {date: tuple(items) for date, items in self._cells.get(name, {}).items()}
+            for name in names
+        }
+        return (
+            list(self.headers),
+            len(dates),
+            ([format_date(date)] + [format_cell(cells[name].get(date)) for name in names] for date in dates),
+        )
+
     def from_json(self, data):
-        self.clear()
+        # Rekap is derived from Input and WI, which rebuild it on load
+        pass
 
     def clear(self):
         self.beginResetModel()
-        self._data = [["" for i in range(0, len(self.headers))]]
+        self._names = []
+        self._dates = []
+        self._cells = {}
+        self._date_counts = {}
+        self.headers = ["Tgl"]
         self.endResetModel()
 
     def get_wi_name(self, data):
-        self.headers = [name for name, JP in data]
-        if not self.headers:
-            return
-
-        self.headerDataChanged.emit(
-            Qt.Horizontal,
-            0,
-            len(self.headers) - 1
-        )
+        names = {name for name, jp in data if name}
 
-        self.headers.sort()
-        self.headers = ["Tgl"] + self.headers
+        for name in [n for n in self._names if n not in names]:
+            self._remove_name(name)
+        for name in sorted(names):
+            if not self._is_shown(name):
+                self._add_name(name)
 
     def get_recap(self, data, data_wi):
-        data_res = {
-                name: [] for name, jp in data_wi
-        }
-
-        for row in data:
-            if row[6] in data_res and\
-               row[0] != "" and\
-               row[4] != "" and\
-               row[5] != "":
-                data_res[row[6]].append([
-                    str(row[0]),
-                    str(row[4]),
-                    str(row[5]),
-                ])
-
-        for name, item in data_res.items():
-            item.sort(key=lambda r: datetime.strptime(r[0], "%d-%m-%Y"))
-
-        all_dates = set()
-
-        for items in data_res.values():
-            for date, _, _ in items:
-                all_dates.add(date)
-
-        all_dates = sorted(
-            all_dates,
-            key=lambda d: datetime.strptime(d, "%d-%m-%Y")
-        )
-
-        lookup = {}
-        for name, items in data_res.items():
-            for date, v1, v2 in items:
-                if (date, name) in lookup:
-                    lookup[(date, name)] += " \n| " + v1 + " - " + v2
-                else:
-                    lookup[(date, name)] = "| " + v1 + " - " + v2
-
-        names = sorted(data_res.keys())
-        result = []
-        for date in all_dates:
-            row = [date]
-            for name in names:
-                row.append(lookup.get((date, name), "-"))
-            result.append(row)
-
         self.beginResetModel()
-        self._data = result
+        self._names = wi_names(data_wi)
+        self._cells = group_sessions(data)
+
+        shown = set(self._names)
+        self._date_counts = {}
+        for name, by_date in self._cells.items():
+            if name in shown:
+                for date, items in by_date.items():
+                    self._date_counts[date] = self._date_counts.get(date, 0) + len(items)
+
+        self._dates = sorted(self._date_counts)
+        self.headers = ["Tgl"] + self._names
         self.endResetModel()
+
+    def apply_changes(self, removed, added):
+        for date, name, item in removed:
+            items = self._cells.get(name, {}).get(date)
+            if not items:
+                continue
+            key = entry_key(item)
+            pos = bisect_left(items, key, key=entry_key)
+            if pos < len(items) and entry_key(items[pos]) == key:
+                del items[pos]
+            if not items:
+                del self._cells[name][date]
+            if self._is_shown(name):
+                self._count(date, -1)
+                self._cell_changed(date, name)
+
+        for date, name, item in added:
+            insort(self._cells.setdefault(name, {}).setdefault(date, []), item, key=entry_key)
+            if self._is_shown(name):
+                self._count(date, 1)
+                self._cell_changed(date, name)
+
+    def _is_shown(self, name):
+        pos = bisect_left(self._names, name)
+        return pos < len(self._names) and self._names[pos] == name
+
+    def _count(self, date, delta):
+        count = self._date_counts.get(date, 0) + delta
+
+        if count > 0 and date not in self._date_counts:
+            row = bisect_left(self._dates, date)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._dates.insert(row, date)
+            self._date_counts[date] = count
+            self.endInsertRows()
+        elif count <= 0 and date in self._date_counts:
+            row = bisect_left(self._dates, date)
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._dates[row]
+            del self._date_counts[date]
+            self.endRemoveRows()
+        elif date in self._date_counts:
+            self._date_counts[date] = count
+
+    def _cell_changed(self, date, name):
+        row = bisect_left(self._dates, date)
+        if row < len(self._dates) and self._dates[row] == date:
+            index = self.index(row, bisect_left(self._names, name) + 1)
+            self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def _add_name(self, name):
+        col = bisect_left(self._names, name) + 1
+        self.beginInsertColumns(QModelIndex(), col, col)
+        self._names.insert(col - 1, name)
+        self.headers.insert(col, name)
+        self.endInsertColumns()
+
+        for date, items in self._cells.get(name, {}).items():
+            self._count(date, len(items))
+            self._cell_changed(date, name)
+
+    def _remove_name(self, name):
+        col = bisect_left(self._names, name) + 1
+        self.beginRemoveColumns(QModelIndex(), col, col)
+        del self._names[col - 1]
+        del self.headers[col]
+        self.endRemoveColumns()
+
+        for date, items in self._cells.get(name, {}).items():
+            self._count(date, -len(items))
@@ -0,0 +1,151 @@
+from contextlib import contextmanager, nullcontext
+from qtpy.QtCore import QObject, QModelIndex
+from qtpy.QtGui import QUndoCommand, QUndoStack
+
+
+class _HistoryCommand(QUndoCommand):
+    """Base for commands recorded after the edit already happened.
+
+    The first redo() is the push itself and does nothing; later undo/redo
+    calls replay the diff through the model's restore methods, which skip
+    validation but update indexes, JP totals and Rekap as any edit does.
+    """
+
+    def __init__(self, history, name, text):
+        super().__init__(text)
+
+        self.history = history
+        self.name = name
+        self._pushed = False
+
+    def redo(self):
+        if not self._pushed:
+            self._pushed = True
+            return
+        with self.history.applying():
+            self._redo(self.history.models[self.name])
+
+    def undo(self):
+        with self.history.applying():
+            self._undo(self.history.models[self.name])
+
+
+class SetCellCommand(_HistoryCommand):
+    def __init__(self, history, name, row, col, old, new):
+        super().__init__(history, name, "Edit cell")
+
+        self.row = row
+        self.col = col
+        self.old = old
+        self.new = new
+
+    def _redo(self, model):
+        model.restore_cell(self.row, self.col, self.new)
+
+    def _undo(self, model):
+        model.restore_cell(self.row, self.col, self.old)
+
+
+class InsertRowsCommand(_HistoryCommand):
+    """Keeps only the range; the rows are taken out when it is undone."""
+
+    def __init__(self, history, name, row, count):
+        super().__init__(history, name, "Insert rows")
+
+        self.row = row
+        self.count = count
+        self.rows = None
+
+    def _redo(self, model):
+        model.restore_rows(self.row, self.rows)
+        self.rows = None
+
+    def _undo(self, model):
+        self.rows = model.rows_at(self.row, self.count)
+        model.removeRows(self.row, self.count, QModelIndex())
+
+
+class RemoveRowsCommand(_HistoryCommand):
+    """Keeps the removed row objects and puts them back as they were.
+
+    Restoring skips validation, so rows with unparsed cells, clashes or
+    unknown WI names come back too.
+    """
+
+    def __init__(self, history, name, row, rows):
+        super().__init__(history, name, "Remove rows")
+
+        self.row = row
+        self.rows = rows
+
+    def _redo(self, model):
+        model.removeRows(self.row, len(self.rows), QModelIndex())
+
+    def _undo(self, model):
+        model.restore_rows(self.row, self.rows)
+
+
+class UndoHistory(QObject):
+    """Undo/redo for the editable tables, on top of a QUndoStack.
+
+    Commands hold diffs, not snapshots: a cell edit keeps the old and new
+    text, an insert keeps its row range and a removal keeps the removed
+    rows. Loading or clearing a model resets the history.
+    """
+
+    def __init__(self, models, batcher=None):
+        super().__init__()
+
+        self.models = models
+        self.batcher = batcher
+        self.stack = QUndoStack(self)
+        self._applying = 0
+
+        for name, model in models.items():
+            model.cellEdited.connect(
+                lambda row, col, old, new, name=name: self._on_cell_edited(name, row, col, old, new)
+            )
+            model.rowsInserted.connect(
+                lambda parent, first, last, name=name: self._on_rows_inserted(name, first, last)
+            )
+            model.rowsAboutToBeRemoved.connect(
+                lambda parent, first, last, name=name: self._on_rows_removed(name, first, last)
+            )
+            model.modelReset.connect(self.stack.clear)
+
+    @contextmanager
+    def applying(self):
+        self._applying += 1
+        try:
+            with self._batch():
+                yield
+        finally:
+            self._applying -= 1
+
+    @contextmanager
+    def macro(self, text):
+        """Group the edits made inside the block into one undo step."""
+        self.stack.beginMacro(text)
+        try:
+            with self._batch():
+                yield
+        finally:
+            self.stack.endMacro()
+
+    def _batch(self):
+        if self.batcher is None:
+            return nullcontext()
+        return self.batcher.batch()
+
+    def _on_cell_edited(self, name, row, col, old, new):
+        if not self._applying and old != new:
+            self.stack.push(SetCellCommand(self, name, row, col, old, new))
+
+    def _on_rows_inserted(self, name, first, last):
+        if not self._applying:
+            self.stack.push(InsertRowsCommand(self, name, first, last - first + 1))
+
+    def _on_rows_removed(self, name, first, last):
+        if not self._applying:
+            rows = self.models[name].rows_at(first, last - first + 1)
+            self.stack.push(RemoveRowsCommand(self, name, first, rows))
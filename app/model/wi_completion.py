@@ -0,0 +1,52 @@
+from qtpy.QtCore import QAbstractListModel, Qt, QModelIndex
+from qtpy.QtGui import QColor
+
+
+class WICompletionModel(QAbstractListModel):
+    """WI names offered by the Nama WI editor, least JP load first.
+
+    One instance is shared by every editor of a column. `set_context` lists
+    the instructors free for the edited session first, from
+    InputTableModel.free_instructors, and the ones who would clash after.
+    """
+
+    NameRole = Qt.UserRole
+
+    def __init__(self, wi_model, parent=None):
+        super().__init__(parent)
+
+        self.wi_model = wi_model
+        self._items = []  # (jp, name, available)
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self._items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        jp, name, available = self._items[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return f"{name} - {jp}"
+        if role == self.NameRole:
+            return name
+        if role == Qt.ForegroundRole and not available:
+            return QColor(Qt.gray)
+        if role == Qt.ToolTipRole and not available:
+            return "Bentrok dengan jadwal lain pada waktu ini."
+
+        return None
+
+    def set_context(self, input_model, row):
+        """Rank for editing `row` (a ScheduleRow of `input_model`)."""
+        load = self.wi_model.load_order()
+        if row is None or row.date is None or row.start is None or row.jp is None:
+            items = [(jp, name, True) for jp, name in load]
+        else:
+            free = set(input_model.free_instructors(row.date, row.start, row.jp, exclude=row))
+            items = [(jp, name, True) for jp, name in load if name in free]
+            items += [(jp, name, False) for jp, name in load if name not in free]
+
+        self.beginResetModel()
+        self._items = items
+        self.endResetModel()
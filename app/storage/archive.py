@@ -0,0 +1,198 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from app.domain.recap import recap_table, wi_names
+from app.domain.schema import (
+    INPUT_HEADERS, COL_DATE, COL_START, COL_JP, COL_END, COL_PELATIHAN, COL_AGENDA, COL_NAME,
+    format_date, format_time,
+)
+
+
+MAGIC = b"WISA"
+VERSION = 1
+ARCHIVE_SUFFIX = ".wisa"
+PROGRESS_STEP = 5000
+
+NO_VALUE = -2 ** 31
+
+# Fixed-width int32 columns, in file order. Row i of a column sits at
+# column offset + 4 * i, which is the whole offset index.
+_COLUMNS = ["date", "start", "jp", "pelatihan", "agenda", "name"]
+_STRING_COLUMNS = {"pelatihan", "agenda", "name"}
+
+
+def write_archive(path, snapshot, progress=None, is_cancelled=None):
+    """Write a read-only archive for `ArchiveReader`.
+
+    Unlike .wisb the body is uncompressed and 4-byte aligned so it can be
+    memory-mapped. The meta block carries a precomputed Rekap and the WI
+    table, so opening an archive never touches the session columns.
+    """
+    rows = snapshot["models"].get("Input") or []
+    wi_rows = snapshot["models"].get("WI") or []
+    strings = {}
+    columns = {attr: array("i") for attr in _COLUMNS}
+    raw = []
+
+    for i, row in enumerate(rows):
+        for attr in _COLUMNS:
+            value = getattr(row, attr)
+            if attr in _STRING_COLUMNS:
+                value = strings.setdefault(value, len(strings))
+            elif value is None:
+                value = NO_VALUE
+            elif value == NO_VALUE:
+                raise ValueError(f"Row {i + 1}: {attr} value {value} cannot be stored in an archive")
+            try:
+                columns[attr].append(value)
+            except OverflowError:
+                raise ValueError(f"Row {i + 1}: {attr} value {value} is out of range for an archive") from None
+        if row.raw:
+            raw.extend([i, col, text] for col, text in row.raw.items())
+
+        if i % PROGRESS_STEP == 0:
+            if is_cancelled and is_cancelled():
+                return False
+            if progress:
+                progress(i, len(rows))
+
+    headers, dates, cells = recap_table(rows, wi_names(wi_rows))
+    meta = {
+        "jp_duration": snapshot["jp_duration"],
+        "rows": len(rows),
+        "strings": list(strings),
+        "raw": raw,
+        "models": {
+            name: data
+            for name, data in snapshot["models"].items()
+            if name != "Input"
+        },
+        "summary": {
+            "recap": {"headers": headers, "dates": dates, "cells": cells},
+        },
+    }
+    meta_bytes = json.dumps(meta).encode("utf-8")
+    meta_bytes += b" " * (-len(meta_bytes) % 4)
+
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC + struct.pack("<HHI", VERSION, 0, len(meta_bytes)))
+            f.write(meta_bytes)
+            for attr in _COLUMNS:
+                column = columns[attr]
+                if sys.byteorder != "little":
+                    column.byteswap()
+                f.write(column.tobytes())
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if progress:
+        progress(len(rows), len(rows))
+    return True
+
+
+class ArchiveReader:
+    """Memory-mapped view of an archive; rows are decoded on request."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError(f"{path} is not a WIS archive")
+
+        try:
+            self._read_layout()
+        except BaseException:
+            self.close()
+            raise
+
+    def _read_layout(self):
+        header_size = len(MAGIC) + 8
+        if len(self._map) < header_size or self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} is not a WIS archive")
+        version, _, meta_len = struct.unpack("<HHI", self._map[len(MAGIC):header_size])
+        if version != VERSION:
+            raise ValueError(f"Unsupported WIS archive version {version}")
+
+        try:
+            self.meta = json.loads(self._map[header_size:header_size + meta_len].decode("utf-8"))
+            self.jp_duration = self.meta["jp_duration"]
+            self.strings = self.meta["strings"]
+            self._rows = self.meta["rows"]
+            self._raw = {}
+            for i, col, text in self.meta["raw"]:
+                self._raw.setdefault(i, {})[col] = text
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"{self.path} is a damaged WIS archive") from None
+
+        offset = header_size + meta_len
+        size = 4 * self._rows
+        if len(self._map) < offset + size * len(_COLUMNS):
+            raise ValueError(f"{self.path} is a truncated WIS archive")
+
+        self._columns = {}
+        for attr in _COLUMNS:
+            if sys.byteorder == "little":
+                column = memoryview(self._map)[offset:offset + size].cast("i")
+            else:
+                column = array("i", self._map[offset:offset + size])
+                column.byteswap()
+            self._columns[attr] = column
+            offset += size
+
+    def __len__(self):
+        return self._rows
+
+    def close(self):
+        if getattr(self, "_columns", None):
+            for column in self._columns.values():
+                if isinstance(column, memoryview):
+                    column.release()
+            self._columns = {}
+        self._rows = 0
+        self._map.close()
+        self._file.close()
+
+    def text(self, i, col):
+        raw = self._raw.get(i)
+        if raw is not None and col in raw:
+            return raw[col]
+
+        columns = self._columns
+        if col == COL_DATE:
+            value = columns["date"][i]
+            return format_date(value) if value != NO_VALUE else ""
+        if col == COL_START:
+            value = columns["start"][i]
+            return format_time(value) if value != NO_VALUE else ""
+        if col == COL_JP:
+            value = columns["jp"][i]
+            return str(value) if value != NO_VALUE else ""
+        if col == COL_END:
+            start, jp = columns["start"][i], columns["jp"][i]
+            if start == NO_VALUE or jp == NO_VALUE:
+                return ""
+            return format_time(start + jp * self.jp_duration)
+        if col == COL_PELATIHAN:
+            return self.strings[columns["pelatihan"][i]]
+        if col == COL_AGENDA:
+            return self.strings[columns["agenda"][i]]
+        if col == COL_NAME:
+            return self.strings[columns["name"][i]]
+        return ""
+
+    def text_rows(self):
+        columns = range(len(INPUT_HEADERS))
+        for i in range(self._rows):
+            yield [self.text(i, col) for col in columns]
@@ -0,0 +1,171 @@
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+from app.domain.schema import ScheduleRow
+
+
+MAGIC = b"WISB"
+VERSION = 1
+FLAG_ZLIB = 1
+PROGRESS_STEP = 5000
+
+# Sentinels for empty/unparsed cells
+NO_DATE = 0
+NO_TIME = -1
+NO_JP = -2 ** 31
+
+# Input columns, in file order: (attribute, array typecode)
+_INT_COLUMNS = [("date", "i"), ("start", "h"), ("jp", "i")]
+_STRING_COLUMNS = ["pelatihan", "agenda", "name"]
+_SENTINELS = {"date": NO_DATE, "start": NO_TIME, "jp": NO_JP}
+
+
+def is_binary_project(path):
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write_binary(path, snapshot, progress=None, is_cancelled=None):
+    """Write a project snapshot in the columnar .wisb format.
+
+    Input rows become little-endian integer columns (date ordinal, Jam
+    Mulai minutes, JP) plus indices into one string table shared by
+    Pelatihan, Agenda and Nama WI. Text that did not parse is kept in a
+    sparse "raw" list. The other models are small and stored as JSON.
+    The body is zlib-compressed. Raises ValueError for values that do
+    not fit their column.
+    """
+    rows = snapshot["models"].get("Input") or []
+    strings = {}
+    ints = {attr: array(code) for attr, code in _INT_COLUMNS}
+    refs = {attr: array("I") for attr in _STRING_COLUMNS}
+    raw = []
+
+    for i, row in enumerate(rows):
+        for attr, _ in _INT_COLUMNS:
+            value = getattr(row, attr)
+            if value is None:
+                value = _SENTINELS[attr]
+            elif value == _SENTINELS[attr]:
+                raise ValueError(f"Row {i + 1}: {attr} value {value} cannot be stored in the binary format")
+            try:
+                ints[attr].append(value)
+            except OverflowError:
+                raise ValueError(f"Row {i + 1}: {attr} value {value} is out of range for the binary format") from None
+        for attr in _STRING_COLUMNS:
+            refs[attr].append(strings.setdefault(getattr(row, attr), len(strings)))
+        if row.raw:
+            raw.extend([i, col, text] for col, text in row.raw.items())
+
+        if i % PROGRESS_STEP == 0:
+            if is_cancelled and is_cancelled():
+                return False
+            if progress:
+                progress(i, len(rows))
+
+    meta = {
+        "jp_duration": snapshot["jp_duration"],
+        "rows": len(rows),
+        "strings": list(strings),
+        "raw": raw,
+        "models": {
+            name: data
+            for name, data in snapshot["models"].items()
+            if name != "Input"
+        },
+    }
+    meta_bytes = json.dumps(meta).encode("utf-8")
+
+    columns = [ints[attr] for attr, _ in _INT_COLUMNS] + [refs[attr] for attr in _STRING_COLUMNS]
+    body = [struct.pack("<I", len(meta_bytes)), meta_bytes]
+    for column in columns:
+        if sys.byteorder != "little":
+            column.byteswap()
+        body.append(column.tobytes())
+    body = b"".join(body)
+
+    body = zlib.compress(body, 6)
+
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC + struct.pack("<BB", VERSION, FLAG_ZLIB))
+            f.write(body)
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if progress:
+        progress(len(rows), len(rows))
+    return True
+
+
+def read_binary(path, progress=None, is_cancelled=None):
+    """Read a .wisb file into the same structure as `read_project`."""
+    with open(path, "rb") as f:
+        header = f.read(len(MAGIC) + 2)
+        body = f.read()
+
+    if header[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a WIS binary project")
+    version, flags = struct.unpack("<BB", header[len(MAGIC):])
+    if version != VERSION:
+        raise ValueError(f"Unsupported WIS binary version {version}")
+    if flags & FLAG_ZLIB:
+        body = zlib.decompress(body)
+
+    (meta_len,) = struct.unpack_from("<I", body)
+    offset = 4 + meta_len
+    meta = json.loads(body[4:offset].decode("utf-8"))
+    n = meta["rows"]
+    jp_duration = meta["jp_duration"]
+
+    columns = {}
+    for attr, code in _INT_COLUMNS + [(attr, "I") for attr in _STRING_COLUMNS]:
+        column = array(code)
+        size = column.itemsize * n
+        column.frombytes(body[offset:offset + size])
+        if sys.byteorder != "little":
+            column.byteswap()
+        columns[attr] = column
+        offset += size
+
+    strings = meta["strings"]
+    dates, starts, jps = columns["date"], columns["start"], columns["jp"]
+    pelatihan, agenda, names = columns["pelatihan"], columns["agenda"], columns["name"]
+
+    rows = []
+    for i in range(n):
+        row = ScheduleRow()
+        if dates[i] != NO_DATE:
+            row.date = dates[i]
+        if starts[i] != NO_TIME:
+            row.start = starts[i]
+        if jps[i] != NO_JP:
+            row.jp = jps[i]
+        row.pelatihan = strings[pelatihan[i]]
+        row.agenda = strings[agenda[i]]
+        row.name = strings[names[i]]
+        row.update_end(jp_duration)
+        rows.append(row)
+
+        if i % PROGRESS_STEP == 0:
+            if is_cancelled and is_cancelled():
+                return None
+            if progress:
+                progress(i, n)
+
+    for i, col, text in meta["raw"]:
+        if rows[i].raw is None:
+            rows[i].raw = {}
+        rows[i].raw[col] = text
+
+    models = dict(meta["models"])
+    models["Input"] = rows
+    return {"jp_duration": jp_duration, "models": models}
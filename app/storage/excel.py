@@ -0,0 +1,161 @@
+from datetime import date, datetime, time
+from app.domain.schema import (
+    INPUT_HEADERS, COL_DATE, COL_START, COL_JP, COL_PELATIHAN, COL_AGENDA, COL_NAME, ScheduleRow,
+)
+
+
+PROGRESS_STEP = 1000
+
+# Sheet headers recognised for each Input column, casefolded
+COLUMN_ALIASES = {
+    COL_DATE: ["tgl/hari", "tgl", "tanggal", "hari/tanggal", "date"],
+    COL_START: ["jam mulai", "mulai", "jam", "start"],
+    COL_JP: ["jp"],
+    COL_PELATIHAN: ["pelatihan", "nama pelatihan"],
+    COL_AGENDA: ["agenda", "mata pelatihan"],
+    COL_NAME: ["nama wi", "wi", "widyaiswara", "pengajar"],
+}
+
+
+def write_workbook(path, sheets, progress=None, is_cancelled=None):
+    """Stream sheets into an .xlsx file.
+
+    `sheets` is a list of (title, headers, row_count, rows) where `rows` is
+    any iterable of lists. The workbook is opened in write-only mode, so
+    rows go straight to disk and memory stays flat for large schedules.
+    Returns False if `is_cancelled` asked to stop.
+    """
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    total = sum(row_count for _, _, row_count, _ in sheets)
+    done = 0
+
+    for title, headers, row_count, rows in sheets:
+        sheet = wb.create_sheet(title=title)
+        sheet.append(headers)
+
+        for row in rows:
+            sheet.append(row)
+            done += 1
+            if done % PROGRESS_STEP == 0:
+                if is_cancelled and is_cancelled():
+                    return False
+                if progress:
+                    progress(done, total)
+
+    wb.save(path)
+    if progress:
+        progress(total, total)
+    return True
+
+
+def read_headers(path):
+    """Return {sheet title: header texts} from the first row of every sheet."""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        headers = {}
+        for sheet in wb.worksheets:
+            first = next(sheet.iter_rows(max_row=1, values_only=True), ())
+            headers[sheet.title] = [cell_text(value) for value in first]
+        return headers
+    finally:
+        wb.close()
+
+
+def match_columns(headers):
+    """Guess {Input column: sheet column} from header texts."""
+    folded = [header.strip().casefold() for header in headers]
+    columns = {}
+    for col, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in folded:
+                columns[col] = folded.index(alias)
+                break
+    return columns
+
+
+def import_workbook(path, sheet, columns, jp_duration, wi_sheet=None, progress=None, is_cancelled=None):
+    """Stream one sheet of an .xlsx file into Input rows.
+
+    `columns` maps Input columns to sheet column numbers; unmapped columns
+    stay empty. Dates and times are normalized to "dd-mm-yyyy" and "HH:MM"
+    whether Excel stored them as dates, numbers or text. The sheet is read
+    in read-only mode and each row becomes a ScheduleRow straight away, so
+    memory grows with the rows kept, not with the workbook.
+
+    WI names come from the first column of `wi_sheet` when given, otherwise
+    from the imported Nama WI. Returns a project like `read_project`, or
+    None when cancelled.
+    """
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet]
+        total = ws.max_row or 0
+        rows = []
+        for i, values in enumerate(ws.iter_rows(min_row=2, values_only=True)):
+            if i % PROGRESS_STEP == 0:
+                if is_cancelled and is_cancelled():
+                    return None
+                if progress:
+                    progress(i, total)
+
+            cells = [""] * len(INPUT_HEADERS)
+            for col, source in columns.items():
+                value = values[source] if source < len(values) else None
+                if col == COL_DATE:
+                    cells[col] = cell_date(value)
+                elif col == COL_START:
+                    cells[col] = cell_time(value)
+                else:
+                    cells[col] = cell_text(value)
+            if any(cells):
+                rows.append(ScheduleRow.from_list(cells, jp_duration))
+
+        if wi_sheet is not None:
+            names = [cell_text(values[0]) for values in wb[wi_sheet].iter_rows(min_row=2, max_col=1, values_only=True)]
+        else:
+            names = [row.name for row in rows]
+    finally:
+        wb.close()
+
+    wi_rows = [[name, 0] for name in dict.fromkeys(names) if name]
+    if progress:
+        progress(total, total)
+    return {"jp_duration": jp_duration, "models": {"Input": rows, "WI": wi_rows}}
+
+
+def cell_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def cell_date(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        from openpyxl.utils.datetime import from_excel
+
+        value = from_excel(value)  # date serial stored without a date format
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%d-%m-%Y")
+
+    text = cell_text(value).replace("/", "-").replace(".", "-")
+    parts = text.split("-")
+    if len(parts) == 3 and len(parts[0]) == 4:  # yyyy-mm-dd
+        text = "-".join(reversed(parts))
+    return text
+
+
+def cell_time(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and 0 <= value < 1:
+        minutes = round(value * 24 * 60)  # fraction of a day
+        return f"{minutes // 60:02d}:{minutes % 60:02d}"
+    if isinstance(value, (datetime, time)):
+        return f"{value.hour:02d}:{value.minute:02d}"
+    return cell_text(value).replace(".", ":")
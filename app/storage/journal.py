@@ -0,0 +1,176 @@
+import glob
+import json
+import os
+import uuid
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+JOURNAL_SUFFIX = ".wisj"
+LOCK_SUFFIX = ".lock"
+
+
+class JournalLock:
+    """Exclusive lock held through an open file for as long as a journal is
+    in use. The OS drops it when the process dies, which is how journals
+    of crashed instances are told apart from those of running ones."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def acquire(self):
+        f = open(self.path, "a+b")
+        try:
+            f.seek(0)
+            if os.name == "nt":
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        self._file = f
+        return True
+
+    def release(self, remove=False):
+        if self._file is None:
+            return
+        if os.name == "nt":
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        self._file.close()
+        self._file = None
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Journal:
+    """Append-only log of the edits made since the project was last saved.
+
+    One JSON record per line. The first line is a header naming the base
+    file the edits apply to; it is only written once there is something to
+    record, so an unmodified project leaves no journal behind. Appends are
+    buffered and reach the disk on `sync`.
+
+    Every running instance owns a journal of its own, guarded by a
+    JournalLock, and only ever deletes that one.
+    """
+
+    def __init__(self, path, lock=None):
+        self.path = path
+        self.lock = lock
+        self._header = None
+        self._file = None
+        self._unsynced = False
+
+    @classmethod
+    def create(cls, directory):
+        """A new journal under `directory`, locked for this instance."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"session-{uuid.uuid4().hex}{JOURNAL_SUFFIX}")
+        lock = JournalLock(path + LOCK_SUFFIX)
+        if not lock.acquire():
+            raise OSError(f"Cannot lock journal {path}")
+        return cls(path, lock)
+
+    def reset(self, base, jp_duration):
+        """Start a new journal on top of `base` (None for an untitled project)."""
+        self.discard()
+        self._header = {"base": base, "jp_duration": jp_duration}
+
+    def append(self, record):
+        if self._header is None:
+            return
+
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._file.write(json.dumps(self._header) + "\n")
+
+        self._file.write(json.dumps(record) + "\n")
+        self._unsynced = True
+
+    def sync(self):
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = False
+
+    def discard(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._unsynced = False
+
+    def close(self):
+        """Delete the journal and give up its lock."""
+        self.discard()
+        if self.lock is not None:
+            self.lock.release(remove=True)
+            self.lock = None
+
+
+def claim_orphan(directory):
+    """Lock and return the newest journal left by an instance that died.
+
+    Returns (journal, header, records), or None when there is nothing to
+    recover. Leftovers without records are deleted on the way; older
+    orphans stay on disk for the next start.
+    """
+    paths = set(glob.glob(os.path.join(directory, "*" + JOURNAL_SUFFIX)))
+    paths.update(
+        path[:-len(LOCK_SUFFIX)]
+        for path in glob.glob(os.path.join(directory, "*" + JOURNAL_SUFFIX + LOCK_SUFFIX))
+    )
+
+    found = []
+    for path in paths:
+        lock = JournalLock(path + LOCK_SUFFIX)
+        if not lock.acquire():
+            continue  # owned by a running instance
+
+        journal = Journal(path, lock)
+        pending = read_journal(journal.path)
+        if pending is None or not pending[1]:
+            journal.close()
+        else:
+            found.append((os.path.getmtime(journal.path), journal, pending))
+
+    if not found:
+        return None
+    found.sort(key=lambda item: item[0])
+    for _, journal, _ in found[:-1]:
+        journal.lock.release()
+    _, journal, (header, records) = found[-1]
+    return journal, header, records
+
+
+def read_journal(path):
+    """Return (header, records) from a journal file, or None if there is none.
+
+    A record cut short by a crash ends the journal; everything before it
+    is kept.
+    """
+    if not os.path.exists(path):
+        return None
+
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            header = json.loads(f.readline())
+        except ValueError:
+            return None
+
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+
+    return header, records
@@ -0,0 +1,105 @@
+import json
+import os
+from app.domain.schema import ScheduleRow
+from app.storage.binary import is_binary_project, read_binary, write_binary
+
+
+PROGRESS_STEP = 2000
+DEFAULT_JP_DURATION = 45
+BINARY_SUFFIX = ".wisb"
+FILE_FILTERS = "WIS Files (*.json);;WIS Binary Files (*.wisb)"
+OPEN_FILTER = "WIS Files (*.json *.wisb)"
+
+
+def read_project(path, progress=None, is_cancelled=None):
+    """Read a project file and parse the Input rows into ScheduleRow.
+
+    JSON and binary (.wisb) files are told apart by their first bytes.
+    Returns {"jp_duration": int, "models": {name: data}}, or None when
+    cancelled. Meant to run off the GUI thread; the caller applies the
+    result to the models.
+    """
+    if is_binary_project(path):
+        return read_binary(path, progress, is_cancelled)
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    jp_duration = data.get("jp_duration", DEFAULT_JP_DURATION)
+    model_data = dict(data.get("models", data))
+
+    if model_data.get("Input") is not None:
+        values = model_data["Input"]
+        rows = []
+        for i, row_values in enumerate(values):
+            rows.append(ScheduleRow.from_list(row_values, jp_duration))
+            if i % PROGRESS_STEP == 0:
+                if is_cancelled and is_cancelled():
+                    return None
+                if progress:
+                    progress(i, len(values))
+        model_data["Input"] = rows
+
+    return {"jp_duration": jp_duration, "models": model_data}
+
+
+def write_project(path, snapshot, progress=None, is_cancelled=None):
+    """Write a snapshot made by the models to `path` as JSON.
+
+    Rows are streamed one per line to a temporary file that replaces `path`
+    only once it is complete, so a cancelled or failed save leaves the old
+    file intact. Paths ending in .wisb are written in the binary format.
+    Returns False when cancelled.
+    """
+    if path.endswith(BINARY_SUFFIX):
+        return write_binary(path, snapshot, progress=progress, is_cancelled=is_cancelled)
+
+    models = snapshot["models"]
+    total = sum(len(rows) for rows in models.values() if rows is not None)
+    done = 0
+    tmp_path = path + ".tmp"
+
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write('{\n  "jp_duration": %s,\n  "models": {' % json.dumps(snapshot["jp_duration"]))
+
+            for n, (name, rows) in enumerate(models.items()):
+                f.write("," if n else "")
+                f.write("\n    %s: " % json.dumps(name))
+                if rows is None:
+                    f.write("null")
+                    continue
+
+                f.write("[")
+                for i, row in enumerate(rows):
+                    if isinstance(row, ScheduleRow):
+                        row = row.to_list()
+                    f.write(",\n      " if i else "\n      ")
+                    f.write(json.dumps(row))
+
+                    done += 1
+                    if done % PROGRESS_STEP == 0:
+                        if is_cancelled and is_cancelled():
+                            raise _Cancelled()
+                        if progress:
+                            progress(done, total)
+                f.write("\n    ]" if rows else "]")
+
+            f.write("\n  }\n}\n")
+
+        os.replace(tmp_path, path)
+    except _Cancelled:
+        os.remove(tmp_path)
+        return False
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if progress:
+        progress(total, total)
+    return True
+
+
+class _Cancelled(Exception):
+    pass
@@ -0,0 +1,83 @@
+from qtpy.QtCore import Qt
+from qtpy.QtWidgets import QMainWindow, QTabWidget, QAction, QAbstractItemView, QFileDialog, QMessageBox
+from app.model.archive_model import ArchiveInputModel, ArchiveRecapModel
+from app.model.WI_model import WITableModel
+from app.storage.archive import ArchiveReader
+from app.storage.excel import write_workbook
+from app.ui.table_page import TablePage
+from app.ui.workers import IOService
+
+
+class ArchiveWindow(QMainWindow):
+    """Read-only viewer for .wisa archives.
+
+    Opening only maps the file and reads its meta block; Input rows are
+    decoded as they scroll into view and Rekap comes from the stored summary.
+    """
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+
+        self.reader = ArchiveReader(path)
+        self.setWindowTitle(f"WIS Archive — {path}")
+        self.resize(900, 600)
+
+        wi_model = WITableModel()
+        wi_model.from_json(self.reader.meta["models"].get("WI") or [])
+        self.models = {
+            "Input": ArchiveInputModel(self.reader),
+            "Rekap": ArchiveRecapModel(self.reader.meta["summary"]["recap"]),
+            "WI": wi_model,
+        }
+
+        tabs = QTabWidget()
+        self.setCentralWidget(tabs)
+        for name, model in self.models.items():
+            page = TablePage(model, is_readonly=True, lazy_rows=(name != "WI"))
+            page.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+            tabs.addTab(page, name)
+
+        self.io = IOService(self)
+        file_menu = self.menuBar().addMenu("File")
+        export_excel_act = QAction("Export Excel…", self)
+        export_excel_act.triggered.connect(self.export_to_excel)
+        file_menu.addAction(export_excel_act)
+
+    def export_to_excel(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Excel",
+            "",
+            "Excel Files (*.xlsx)"
+        )
+
+        if not path:
+            return
+
+        if not path.endswith(".xlsx"):
+            path += ".xlsx"
+
+        sheets = [
+            (name, *model.export_snapshot())
+            for name, model in self.models.items()
+        ]
+        self.io.run(
+            "Exporting…",
+            write_workbook, path, sheets,
+            on_finished=lambda _: QMessageBox.information(
+                self, "Export Successful", f"Data successfully exported to {path}"
+            ),
+            on_failed=lambda message: QMessageBox.critical(self, "Export failed", message),
+        )
+
+    def closeEvent(self, event):
+        if self.io.is_busy():
+            event.ignore()
+            return
+
+        input_model = self.models["Input"]
+        input_model.beginResetModel()
+        self.reader.close()
+        input_model.endResetModel()
+        event.accept()
@@ -0,0 +1,51 @@
+from qtpy.QtCore import Qt, Signal
+from qtpy.QtWidgets import QDockWidget, QLabel, QListWidget, QListWidgetItem, QVBoxLayout, QWidget
+
+
+# Listing more than this many issues only slows the panel down
+MAX_SHOWN = 5000
+
+
+class AuditPanel(QDockWidget):
+    """Dockable list of schedule problems; activating one jumps to its cell."""
+
+    cellActivated = Signal(int, int)  # row, column
+
+    def __init__(self, parent=None):
+        super().__init__("Schedule Check", parent)
+
+        self.setObjectName("AuditPanel")
+
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.setContentsMargins(4, 4, 4, 4)
+        self.summary = QLabel("Not checked yet.")
+        self.list = QListWidget()
+        self.list.itemActivated.connect(self._on_item_activated)
+        layout.addWidget(self.summary)
+        layout.addWidget(self.list)
+        self.setWidget(widget)
+
+    def set_issues(self, issues):
+        """Show [(row, column, message)] from Schedule.validate."""
+        self.list.clear()
+        rows = len({row for row, _, _ in issues})
+        self.summary.setText(
+            f"{len(issues)} issues in {rows} rows." if issues else "No issues found."
+        )
+
+        for row, col, message in issues[:MAX_SHOWN]:
+            item = QListWidgetItem(f"Baris {row + 1}: {message}")
+            item.setData(Qt.UserRole, (row, col))
+            self.list.addItem(item)
+        if len(issues) > MAX_SHOWN:
+            self.list.addItem(f"... dan {len(issues) - MAX_SHOWN} lainnya")
+
+        if issues:
+            self.show()
+            self.raise_()
+
+    def _on_item_activated(self, item):
+        cell = item.data(Qt.UserRole)
+        if cell is not None:
+            self.cellActivated.emit(*cell)
@@ -0,0 +1,68 @@
+from qtpy.QtWidgets import QComboBox, QDialog, QDialogButtonBox, QFormLayout
+from app.domain.schema import INPUT_HEADERS, COL_END
+from app.storage.excel import match_columns
+
+
+class ImportDialog(QDialog):
+    """Pick the sheet to import and which of its columns feeds each Input column."""
+
+    def __init__(self, headers, parent=None):
+        super().__init__(parent)
+
+        self.setWindowTitle("Import Excel")
+        self.headers = headers  # sheet title -> header texts
+
+        self.form = QFormLayout(self)
+        self.sheet_box = QComboBox()
+        self.sheet_box.addItems(list(headers))
+        self.form.addRow("Sheet", self.sheet_box)
+
+        self.column_boxes = {}
+        for col, header in enumerate(INPUT_HEADERS):
+            if col != COL_END:
+                self.column_boxes[col] = QComboBox()
+                self.form.addRow(header, self.column_boxes[col])
+
+        self.wi_box = QComboBox()
+        self.form.addRow("WI", self.wi_box)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        self.form.addRow(buttons)
+
+        self.sheet_box.currentTextChanged.connect(self._fill_columns)
+        self._fill_columns(self.sheet_box.currentText())
+
+        # Our own exports keep the names on a "WI" sheet
+        if "WI" in headers:
+            self.wi_box.setCurrentText("WI")
+
+    def _fill_columns(self, sheet):
+        headers = self.headers.get(sheet, [])
+        matched = match_columns(headers)
+        for col, box in self.column_boxes.items():
+            box.clear()
+            box.addItem("-", None)
+            for i, header in enumerate(headers):
+                box.addItem(header or f"Kolom {i + 1}", i)
+            box.setCurrentIndex(matched[col] + 1 if col in matched else 0)
+
+        self.wi_box.clear()
+        self.wi_box.addItem("(dari Nama WI)", None)
+        for title in self.headers:
+            if title != sheet:
+                self.wi_box.addItem(title, title)
+
+    def sheet(self):
+        return self.sheet_box.currentText()
+
+    def columns(self):
+        return {
+            col: box.currentData()
+            for col, box in self.column_boxes.items()
+            if box.currentData() is not None
+        }
+
+    def wi_sheet(self):
+        return self.wi_box.currentData()
@@ -0,0 +1,117 @@
+from qtpy.QtCore import QObject, QEvent, QTimer, Qt
+from qtpy.QtWidgets import QHeaderView, QStyle, QStyledItemDelegate
+
+
+CELL_MARGIN = 3
+
+
+class LazyRowHeights(QObject):
+    """Row heights for big tables, sized only as rows scroll into view.
+
+    Replaces QHeaderView.ResizeToContents, which lays out the text of every
+    row after each reset. A row's height is its largest number of lines
+    times the font's line spacing; it is worked out the first time the row
+    becomes visible and cached until the row's data changes.
+    """
+
+    def __init__(self, table):
+        super().__init__(table)
+
+        self.table = table
+        self._sized = set()
+        self._scheduled = False
+
+        header = table.verticalHeader()
+        header.setSectionResizeMode(QHeaderView.Fixed)
+        header.setDefaultSectionSize(self._height(1))
+
+        table.verticalScrollBar().valueChanged.connect(self._schedule)
+        table.viewport().installEventFilter(self)
+
+        model = table.model()
+        model.modelReset.connect(self._invalidate)
+        model.layoutChanged.connect(self._invalidate)
+        model.rowsInserted.connect(self._invalidate)
+        model.rowsRemoved.connect(self._invalidate)
+        model.dataChanged.connect(self._on_data_changed)
+        self._schedule()
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Resize, QEvent.Show):
+            self._schedule()
+        return False
+
+    def _invalidate(self, *args):
+        self._sized.clear()
+        self._schedule()
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        for r in range(top_left.row(), bottom_right.row() + 1):
+            self._sized.discard(r)
+        self._schedule()
+
+    def _schedule(self, *args):
+        if not self._scheduled:
+            self._scheduled = True
+            QTimer.singleShot(0, self._update)
+
+    def _update(self):
+        self._scheduled = False
+        header = self.table.verticalHeader()
+        model = self.table.model()
+        row = self.table.rowAt(0)
+        if row < 0:
+            return
+
+        y = header.sectionViewportPosition(row)
+        bottom = self.table.viewport().height()
+        rows = model.rowCount()
+        while row < rows and y < bottom:
+            if row not in self._sized:
+                self._sized.add(row)
+                height = self._height(self._line_count(model, row))
+                if header.sectionSize(row) != height:
+                    header.resizeSection(row, height)
+            y += header.sectionSize(row)
+            row += 1
+
+    def _line_count(self, model, row):
+        lines = 1
+        for col in range(model.columnCount()):
+            text = model.data(model.index(row, col), Qt.DisplayRole)
+            if isinstance(text, str):
+                lines = max(lines, text.count("\n") + 1)
+        return lines
+
+    def _height(self, lines):
+        return lines * self.table.fontMetrics().lineSpacing() + 2 * CELL_MARGIN
+
+
+class LinesDelegate(QStyledItemDelegate):
+    """Draws a cell's text line by line, eliding long lines.
+
+    The tables only provide display text, so painting reads that one role
+    and skips QStyledItemDelegate's style-option setup and word-wrapping
+    text layout; a multi-session Rekap cell costs one drawText per line.
+    """
+
+    def paint(self, painter, option, index):
+        text = index.data(Qt.DisplayRole)
+
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+            painter.setPen(option.palette.highlightedText().color())
+        else:
+            painter.setPen(option.palette.text().color())
+
+        if text:
+            metrics = option.fontMetrics
+            rect = option.rect.adjusted(CELL_MARGIN, CELL_MARGIN, -CELL_MARGIN, -CELL_MARGIN)
+            y = rect.top() + metrics.ascent()
+            for line in str(text).split("\n"):
+                if y - metrics.ascent() >= rect.bottom():
+                    break
+                painter.drawText(rect.left(), y, metrics.elidedText(line, Qt.ElideRight, rect.width()))
+                y += metrics.lineSpacing()
+        painter.restore()
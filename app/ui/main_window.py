@@ -1,13 +1,32 @@
-from qtpy.QtWidgets import QMainWindow, QInputDialog
+import os
+from qtpy.QtCore import QStandardPaths, QTimer, Qt
+from qtpy.QtGui import QKeySequence
+from qtpy.QtWidgets import QMainWindow, QInputDialog, QDialog
 from app.ui.table_page import TablePage
 from qtpy.QtWidgets import QTabWidget
 from app.model.WI_model import WITableModel
 from app.model.input_model import InputTableModel
 from app.model.recap_model import RecapTableModel
+from app.model.batch import ChangeBatcher
+from app.model.journal import JournalRecorder
+from app.model.undo import UndoHistory
 from qtpy.QtWidgets import QAction
-from qtpy.QtCore import Qt
-import json
 from qtpy.QtWidgets import QFileDialog, QMessageBox
+from app.domain.assign import assign_sessions
+from app.domain.schedule import audit_rows
+from app.domain.schema import COL_DATE, COL_NAME
+from app.storage.excel import write_workbook, read_headers, import_workbook
+from app.storage.project import read_project, write_project, BINARY_SUFFIX, FILE_FILTERS, OPEN_FILTER
+from app.storage.archive import write_archive, ARCHIVE_SUFFIX
+from app.storage.journal import Journal, claim_orphan
+from app.ui.archive_window import ArchiveWindow
+from app.ui.audit_panel import AuditPanel
+from app.ui.import_dialog import ImportDialog
+from app.ui.workers import IOService
+
+
+# Journal appends reach the disk at most this long after the edit
+JOURNAL_SYNC_MS = 2000
 
 
 class MainWindow(QMainWindow):
@@ -17,46 +36,82 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("WIS")
         self.resize(900, 600)
 
+        # Edits are propagated to WI, Rekap and the dirty flag once per
+        # event-loop turn (or per explicit batch) instead of once per row
+        self.batcher = ChangeBatcher()
+
         # Example pages
         self.models = {
-            "Input": InputTableModel(45),
+            "Input": InputTableModel(45, batcher=self.batcher),
             "Rekap": RecapTableModel(),
         }
-        self.models["WI"] = WITableModel()
+        self.models["WI"] = WITableModel(batcher=self.batcher)
         self.models["Input"].wi_model = self.models["WI"]
         self.models["WI"].set_input_model(self.models["Input"])
-
-
-        tabs = QTabWidget()
-        self.setCentralWidget(tabs)
+        self.history = UndoHistory({
+            "Input": self.models["Input"],
+            "WI": self.models["WI"],
+        }, batcher=self.batcher)
+
+        self.tabs = QTabWidget()
+        self.setCentralWidget(self.tabs)
+        self.pages = {}
         for name, model in self.models.items():
             if name == "Input":
-                tabs.addTab(
-                    TablePage(
-                        model,
-                        wi_model=self.models["WI"],
-                    ),
-                    name
+                page = TablePage(
+                    model,
+                    wi_model=self.models["WI"],
+                    batcher=self.batcher,
+                    history=self.history,
+                    lazy_rows=True,
+                    filterable=True,
                 )
             elif name == "Rekap":
-                tabs.addTab(
-                    TablePage(
-                        model,
-                        is_readonly=True
-                    ),
-                    name
+                page = TablePage(
+                    model,
+                    is_readonly=True,
+                    lazy_rows=True,
                 )
             else:
-                tabs.addTab(TablePage(model), name)
+                page = TablePage(model, batcher=self.batcher, history=self.history)
+            self.pages[name] = page
+            self.tabs.addTab(page, name)
+
+        self.audit_panel = AuditPanel(self)
+        self.audit_panel.hide()
+        self.audit_panel.cellActivated.connect(self.show_input_cell)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.audit_panel)
+
+        # Edits since the last save are journaled so they survive a crash.
+        # Each instance writes its own journal; one left by an instance
+        # that died is claimed and recovered.
+        journal_dir = os.path.join(
+            QStandardPaths.writableLocation(QStandardPaths.AppDataLocation),
+            "journals",
+        )
+        orphan = claim_orphan(journal_dir)
+        self.journal = Journal.create(journal_dir)
+        self.recorder = JournalRecorder(self.journal, {
+            "Input": self.models["Input"],
+            "WI": self.models["WI"],
+        })
+        self._journal_timer = QTimer(self)
+        self._journal_timer.timeout.connect(self.journal.sync)
+        self._journal_timer.start(JOURNAL_SYNC_MS)
 
         self.current_file = None
         self.is_dirty = False
         self.jp_duration = 45
+        self.io = IOService(self)
         self._create_file_menu()
+        self._create_edit_menu()
         self._create_settings_menu()
         self._connect_dirty_signals()
         self.new_file()
 
+        if orphan is not None:
+            QTimer.singleShot(0, lambda: self._recover(*orphan))
+
         self.models["Rekap"].get_wi_name(self.models["WI"]._data)
 
         self.models["Input"].validationFailed.connect(
@@ -68,19 +123,29 @@ class MainWindow(QMainWindow):
             )
 
         self.models["WI"].WIChanged.connect(
+                self.update_rekap_names
+            )
+
+        self.models["WI"].modelReset.connect(
                 self.update_rekap
             )
 
-        self.models["Input"].inputChanged.connect(
+        self.models["Input"].modelReset.connect(
                 self.update_rekap
             )
 
+        self.models["Input"].sessionsChanged.connect(
+                self.models["Rekap"].apply_changes
+            )
+
     def update_rekap(self):
-        self.models["Rekap"].get_wi_name(self.models["WI"]._data)
         self.models["Rekap"].get_recap(
-                self.models["Input"]._data, 
+                self.models["Input"]._data,
                 self.models["WI"]._data)
 
+    def update_rekap_names(self):
+        self.models["Rekap"].get_wi_name(self.models["WI"]._data)
+
     def _create_file_menu(self):
         file_menu = self.menuBar().addMenu("File")
 
@@ -102,15 +167,54 @@ class MainWindow(QMainWindow):
 
         file_menu.addSeparator()
 
+        import_excel_act = QAction("Import Excel…", self)
+        import_excel_act.triggered.connect(self.import_excel)
+
         export_excel_act = QAction("Export Excel…", self)
         export_excel_act.triggered.connect(self.export_to_excel)
 
+        export_archive_act = QAction("Export Archive…", self)
+        export_archive_act.triggered.connect(self.export_archive)
+
+        open_archive_act = QAction("Open Archive (read-only)…", self)
+        open_archive_act.triggered.connect(self.open_archive)
+
         file_menu.addActions([
             new_act,
             open_act,
             save_act,
             save_as_act,
+            import_excel_act,
             export_excel_act,
+            export_archive_act,
+            open_archive_act,
+        ])
+
+    def _create_edit_menu(self):
+        edit_menu = self.menuBar().addMenu("Edit")
+
+        undo_act = self.history.stack.createUndoAction(self, "Undo")
+        undo_act.setShortcut(QKeySequence.Undo)
+
+        redo_act = self.history.stack.createRedoAction(self, "Redo")
+        redo_act.setShortcut(QKeySequence.Redo)
+
+        auto_assign_act = QAction("Auto-assign WI…", self)
+        auto_assign_act.triggered.connect(self.auto_assign)
+
+        edit_menu.addActions([
+            undo_act,
+            redo_act,
+        ])
+        check_act = QAction("Check Schedule", self)
+        check_act.setShortcut("F7")
+        check_act.triggered.connect(self.check_schedule)
+
+        edit_menu.addSeparator()
+        edit_menu.addActions([
+            auto_assign_act,
+            check_act,
+            self.audit_panel.toggleViewAction(),
         ])
 
     def _create_settings_menu(self):
@@ -131,58 +235,72 @@ class MainWindow(QMainWindow):
         )
 
         if ok:
-            self.jp_duration = new_duration
-            self.models["Input"].set_jp_duration(new_duration)
-            self._mark_dirty()
+            self._set_jp_duration(new_duration)
+
+    def _set_jp_duration(self, jp_duration):
+        self.jp_duration = jp_duration
+        self.models["Input"].set_jp_duration(jp_duration)
+        self.journal.append({"op": "jp", "value": jp_duration})
+        self._mark_dirty()
 
     def new_file(self):
         if not self._maybe_save():
             return
 
-        for model in self.models.values():
-            model.clear()
+        with self.batcher.batch():
+            for model in self.models.values():
+                model.clear()
 
         self.current_file = None
         self.is_dirty = False
         self.jp_duration = 45
+        self.journal.reset(None, self.jp_duration)
         self._update_title()
 
-    def save_file(self):
+    def save_file(self, wait=False):
         if self.current_file is None:
-            self.save_file_as()
-            if self.current_file is None:  # User cancelled Save As
-                return
+            self.save_file_as(wait=wait)
+            return
 
-        data = {
+        path = self.current_file
+        snapshot = {
             "jp_duration": self.jp_duration,
             "models": {
-                name: model.to_json()
+                name: model.snapshot()
                 for name, model in self.models.items()
             }
         }
 
-        with open(self.current_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        self.io.run(
+            "Saving…",
+            write_project, path, snapshot,
+            on_finished=lambda _: self._on_saved(path),
+            on_failed=lambda message: QMessageBox.critical(self, "Save failed", message),
+            wait=wait,
+        )
 
-        self.is_dirty = False
-        self._update_title()
+    def _on_saved(self, path):
+        if path == self.current_file:
+            self.journal.reset(path, self.jp_duration)
+            self.is_dirty = False
+            self._update_title()
 
-    def save_file_as(self):
-        path, _ = QFileDialog.getSaveFileName(
+    def save_file_as(self, wait=False):
+        path, selected_filter = QFileDialog.getSaveFileName(
             self,
             "Save As",
             "",
-            "WIS Files (*.json)"
+            FILE_FILTERS
         )
 
         if not path:
             return
 
-        if not path.endswith(".json"):
-            path += ".json"
+        if not path.endswith((".json", BINARY_SUFFIX)):
+            path += BINARY_SUFFIX if BINARY_SUFFIX in selected_filter else ".json"
 
         self.current_file = path
-        self.save_file()
+        self.save_file(wait=wait)
 
     def open_file(self):
         if not self._maybe_save():
@@ -191,31 +309,96 @@ class MainWindow(QMainWindow):
             self,
             "Open File",
             "",
-            "WIS Files (*.json)"
+            OPEN_FILTER
         )
 
         if not path:
             return
 
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            self.jp_duration = data.get("jp_duration", 45)
-            self.models["Input"].set_jp_duration(self.jp_duration)
-
-            model_data = data.get("models", data)
+        self.io.run(
+            "Opening…",
+            read_project, path,
+            on_finished=lambda data: self._apply_project(path, data) and self.check_schedule(),
+            on_failed=lambda message: QMessageBox.critical(self, "Open failed", message),
+        )
 
-            for name, model in self.models.items():
-                if name in model_data:
-                    model.from_json(model_data[name])
+    def _apply_project(self, path, data):
+        try:
+            self.jp_duration = data["jp_duration"]
+            model_data = data["models"]
+
+            with self.batcher.batch():
+                for name, model in self.models.items():
+                    if name == "Input" and model_data.get(name) is not None:
+                        model.load_rows(model_data[name], self.jp_duration)
+                    elif name == "Input":
+                        model.set_jp_duration(self.jp_duration)
+                    elif name in model_data:
+                        model.from_json(model_data[name])
 
             self.current_file = path
             self.is_dirty = False
+            self.journal.reset(path, self.jp_duration)
             self._update_title()
 
         except Exception as e:
             QMessageBox.critical(self, "Open failed", str(e))
+            return False
+        return True
+
+    def _recover(self, orphan, header, records):
+        # Replayed edits are journaled again in our own journal, after
+        # which the orphan can go
+        base = header.get("base")
+        if base is None:
+            self.journal.reset(None, self.jp_duration)
+            if header.get("jp_duration", self.jp_duration) != self.jp_duration:
+                self._set_jp_duration(header["jp_duration"])
+            self._replay(records)
+            orphan.close()
+        elif os.path.exists(base):
+            self.io.run(
+                "Recovering…",
+                read_project, base,
+                on_finished=lambda data: (
+                    (self._replay(records), orphan.close())
+                    if self._apply_project(base, data)
+                    else orphan.lock.release()  # left for the next start
+                ),
+                on_failed=lambda message: (
+                    orphan.lock.release(),  # left for the next start
+                    QMessageBox.critical(self, "Recovery failed", message),
+                ),
+            )
+        else:
+            orphan.close()
+            QMessageBox.warning(
+                self, "Recovery failed",
+                f"Unsaved changes to {base} could not be recovered: the file no longer exists."
+            )
+
+    def _replay(self, records):
+        # Records address rows by position, so once one is rejected the
+        # positions in the rest no longer line up and replay stops there
+        applied = 0
+        with self.batcher.batch():
+            for record in records:
+                if record["op"] == "jp":
+                    self._set_jp_duration(record["value"])
+                elif record["op"] == "load":
+                    self._replay_load(record)
+                elif not self.recorder.apply(record):
+                    break
+                applied += 1
+
+        self._mark_dirty()
+        message = f"Recovered {applied} unsaved changes from the last session."
+        if applied < len(records):
+            message += (
+                f"\nChange {applied + 1} could not be applied; it and the "
+                f"{len(records) - applied - 1} changes after it were skipped."
+            )
+        QMessageBox.information(self, "Recovered", message)
 
     def _update_title(self):
         name = self.current_file or "Untitled"
@@ -226,11 +409,7 @@ class MainWindow(QMainWindow):
         QMessageBox.warning(self, "Validation Error", message)
 
     def _connect_dirty_signals(self):
-        for name, model in self.models.items():
-            model.dataChanged.connect(self._mark_dirty)
-            model.rowsInserted.connect(self._mark_dirty)
-            model.rowsRemoved.connect(self._mark_dirty)
-            model.modelReset.connect(self._mark_dirty)
+        self.batcher.flushed.connect(self._mark_dirty)
 
     def _mark_dirty(self, *args, **kwargs):
         if not self.is_dirty:
@@ -238,7 +417,10 @@ class MainWindow(QMainWindow):
             self._update_title()
 
     def closeEvent(self, event):
-        if self._maybe_save():
+        if self.io.is_busy():
+            event.ignore()
+        elif self._maybe_save():
+            self.journal.close()
             event.accept()
         else:
             event.ignore()
@@ -255,7 +437,7 @@ class MainWindow(QMainWindow):
         )
 
         if res == QMessageBox.Save:
-            self.save_file()
+            self.save_file(wait=True)
             return not self.is_dirty  # in case user canceled Save As
 
         if res == QMessageBox.Discard:
@@ -263,9 +445,65 @@ class MainWindow(QMainWindow):
 
         return False
 
+    def import_excel(self):
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            QMessageBox.critical(self, "Error", "openpyxl is not installed. Please install it using: pip install openpyxl")
+            return
+
+        if not self._maybe_save():
+            return
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Import Excel",
+            "",
+            "Excel Files (*.xlsx)"
+        )
+
+        if not path:
+            return
+
+        try:
+            headers = read_headers(path)
+        except Exception as e:
+            QMessageBox.critical(self, "Import failed", str(e))
+            return
+
+        dialog = ImportDialog(headers, self)
+        if dialog.exec() != QDialog.Accepted:
+            return
+
+        self.io.run(
+            "Importing…",
+            import_workbook, path, dialog.sheet(), dialog.columns(), self.jp_duration, dialog.wi_sheet(),
+            on_finished=self._apply_import,
+            on_failed=lambda message: QMessageBox.critical(self, "Import failed", message),
+        )
+
+    def _apply_import(self, data):
+        # Imported data becomes a new untitled project. Resets are not
+        # journaled like edits, so the rows are logged as one "load" record.
+        if not self._apply_project(None, data):
+            return
+        self.journal.append({
+            "op": "load",
+            "models": {
+                "Input": self.models["Input"].to_json(),
+                "WI": self.models["WI"].to_json(),
+            },
+        })
+        self._mark_dirty()
+        self.check_schedule()
+
+    def _replay_load(self, record):
+        self.journal.append(record)
+        for name, data in record["models"].items():
+            self.models[name].from_json(data)
+
     def export_to_excel(self):
         try:
-            import openpyxl
+            import openpyxl  # noqa: F401
         except ImportError:
             QMessageBox.critical(self, "Error", "openpyxl is not installed. Please install it using: pip install openpyxl")
             return
@@ -283,26 +521,133 @@ class MainWindow(QMainWindow):
         if not path.endswith(".xlsx"):
             path += ".xlsx"
 
+        # Rows are copied on the GUI thread, since the user may keep editing
+        # them while the worker runs; that costs one parsed copy per row.
+        # Cell text is still produced and streamed to disk on the worker
+        # thread, so the formatted sheet is never held in memory.
+        sheets = [
+            (name, *model.export_snapshot())
+            for name, model in self.models.items()
+        ]
+
+        self.io.run(
+            "Exporting…",
+            write_workbook, path, sheets,
+            on_finished=lambda _: QMessageBox.information(
+                self, "Export Successful", f"Data successfully exported to {path}"
+            ),
+            on_failed=lambda message: QMessageBox.critical(self, "Export failed", message),
+        )
+
+    def export_archive(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Archive",
+            "",
+            f"WIS Archive Files (*{ARCHIVE_SUFFIX})"
+        )
+
+        if not path:
+            return
+
+        if not path.endswith(ARCHIVE_SUFFIX):
+            path += ARCHIVE_SUFFIX
+
+        snapshot = {
+            "jp_duration": self.jp_duration,
+            "models": {
+                name: model.snapshot()
+                for name, model in self.models.items()
+            }
+        }
+
+        self.io.run(
+            "Exporting archive…",
+            write_archive, path, snapshot,
+            on_finished=lambda _: QMessageBox.information(
+                self, "Export Successful", f"Archive successfully exported to {path}"
+            ),
+            on_failed=lambda message: QMessageBox.critical(self, "Export failed", message),
+        )
+
+    def open_archive(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Open Archive",
+            "",
+            f"WIS Archive Files (*{ARCHIVE_SUFFIX})"
+        )
+
+        if not path:
+            return
+
         try:
-            wb = openpyxl.Workbook()
-            # Remove the default sheet
-            if "Sheet" in wb.sheetnames:
-                del wb["Sheet"]
-
-            for name, model in self.models.items():
-                sheet = wb.create_sheet(title=name)
-
-                # Write headers
-                headers = [model.headerData(i, Qt.Horizontal) for i in range(model.columnCount())]
-                sheet.append(headers)
-
-                # Write data
-                for r in range(model.rowCount()):
-                    row_data = [model.data(model.index(r, c)) for c in range(model.columnCount())]
-                    sheet.append(row_data)
-            
-            wb.save(path)
-            QMessageBox.information(self, "Export Successful", f"Data successfully exported to {path}")
+            window = ArchiveWindow(path, self)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Open failed", str(e))
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Export failed", str(e))
+        window.show()
+
+    def check_schedule(self):
+        self.io.run(
+            "Checking schedule…",
+            audit_rows,
+            self.models["Input"].snapshot(),
+            self.jp_duration,
+            [name for name, _ in self.models["WI"].snapshot() if name],
+            on_finished=self.audit_panel.set_issues,
+            on_failed=lambda message: QMessageBox.critical(self, "Check failed", message),
+        )
+
+    def show_input_cell(self, row, col):
+        self.tabs.setCurrentWidget(self.pages["Input"])
+        self.pages["Input"].show_cell(row, col)
+
+    def auto_assign(self):
+        rows = self.models["Input"].snapshot()
+        self.io.run(
+            "Assigning WI…",
+            assign_sessions,
+            rows,
+            list(self.models["WI"].load_order()),
+            on_finished=lambda result: self._apply_assignments(rows, result),
+            on_failed=lambda message: QMessageBox.critical(self, "Auto-assign failed", message),
+        )
+
+    def _apply_assignments(self, rows, result):
+        assignments, unplaced = result
+        model = self.models["Input"]
+        wi_model = self.models["WI"]
+
+        # Rows may have been edited before the progress dialog went modal,
+        # so an assignment is only written to a row that still matches the
+        # snapshot it was computed from (and so still names no WI). Clashes
+        # are checked here so setData has nothing to reject one box at a time.
+        rejected = []
+        assigned = 0
+        with self.history.macro("Auto-assign WI"):
+            for i, name in assignments:
+                live = model.schedule_row(i) if i < model.rowCount() else None
+                if live is None or live.name or live.to_list() != rows[i].to_list():
+                    rejected.append((i, "Baris diubah selama penugasan berjalan."))
+                elif wi_model.resolve_name(name) is None:
+                    rejected.append((i, f"Nama WI '{name}' tidak ditemukan di tabel WI."))
+                elif model.schedule.find_clash(name, live.date, live.start, live.jp, exclude=live) is not None:
+                    rejected.append((i, f"Jadwal bentrok untuk {name} pada {live.text(COL_DATE)}!"))
+                elif model.setData(model.index(i, COL_NAME), name):
+                    assigned += 1
+                else:
+                    rejected.append((i, f"{name} tidak dapat ditetapkan."))
+
+        message = f"Assigned a WI to {assigned} sessions."
+        for problems, text in (
+            (rejected, "assignments were not applied"),
+            (unplaced, "sessions could not be placed"),
+        ):
+            if problems:
+                lines = [f"Baris {i + 1}: {reason}" for i, reason in problems[:10]]
+                if len(problems) > 10:
+                    lines.append(f"... dan {len(problems) - 10} baris lainnya")
+                message += f"\n{len(problems)} {text}:\n" + "\n".join(lines)
+        QMessageBox.information(self, "Auto-assign", message)
@@ -1,24 +1,41 @@
-from qtpy.QtWidgets import QWidget, QVBoxLayout, QTableView, QSizePolicy
+import csv
+import io
+from contextlib import nullcontext
+from qtpy.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTableView, QSizePolicy
 from qtpy.QtWidgets import QStyledItemDelegate, QTimeEdit, QDateEdit, QLineEdit, QComboBox, QCompleter
 from qtpy.QtCore import QDate
-from qtpy.QtGui import QIntValidator
+from qtpy.QtGui import QIntValidator, QKeySequence, QGuiApplication
 from qtpy.QtCore import QTime
 from qtpy.QtWidgets import QHeaderView
 from qtpy.QtCore import Qt
-from qtpy.QtWidgets import QMenu
+from qtpy.QtWidgets import QMenu, QAction
+from app.model.input_filter import InputFilterProxy
+from app.model.wi_completion import WICompletionModel
+from app.domain.schema import parse_date_range
+from app.ui.lazy_rows import LazyRowHeights, LinesDelegate
 
 
 class TablePage(QWidget):
-    def __init__(self, model, wi_model=None, is_readonly=False):
+    def __init__(self, model, wi_model=None, is_readonly=False, batcher=None, lazy_rows=False, history=None,
+                 filterable=False):
         super().__init__()
 
+        self.model = model
         self.wi_model = wi_model
+        self.batcher = batcher
+        self.history = history
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)  # important
         layout.setSpacing(0)
 
         self.table = QTableView(self)
-        self.table.setModel(model)
+        if filterable:
+            self.proxy = InputFilterProxy(self)
+            self.proxy.setSourceModel(model)
+            self.table.setModel(self.proxy)
+            layout.addLayout(self._create_filter_bar())
+        else:
+            self.table.setModel(model)
 
         self.table.setSizePolicy(
             QSizePolicy.Expanding,
@@ -29,10 +46,16 @@ class TablePage(QWidget):
             QHeaderView.Stretch
         )
 
-        self.table.setWordWrap(True)
-        self.table.verticalHeader().setSectionResizeMode(
-            QHeaderView.ResizeToContents
-        )
+        if lazy_rows:
+            # Big tables: only visible rows are measured and painted
+            self.table.setWordWrap(False)
+            self.table.setItemDelegate(LinesDelegate(self.table))
+            self.row_heights = LazyRowHeights(self.table)
+        else:
+            self.table.setWordWrap(True)
+            self.table.verticalHeader().setSectionResizeMode(
+                QHeaderView.ResizeToContents
+            )
 
         layout.addWidget(self.table)
 
@@ -41,6 +64,12 @@ class TablePage(QWidget):
             self.table.customContextMenuRequested.connect(
                 self.open_context_menu
             )
+
+            paste_act = QAction("Paste rows", self.table)
+            paste_act.setShortcut(QKeySequence.Paste)
+            paste_act.setShortcutContext(Qt.WidgetWithChildrenShortcut)
+            paste_act.triggered.connect(lambda: self.paste_rows())
+            self.table.addAction(paste_act)
         for col, delegate in model.delegates.items():
             if delegate == "date":
                 self.table.setItemDelegateForColumn(col, DateDelegate(self.table))
@@ -52,18 +81,71 @@ class TablePage(QWidget):
                 if self.wi_model:
                     self.table.setItemDelegateForColumn(col, WIDelegate(self.table, self.wi_model))
 
+    def _create_filter_bar(self):
+        bar = QHBoxLayout()
+        bar.setContentsMargins(4, 4, 4, 4)
+
+        self.name_filter = QLineEdit()
+        self.name_filter.setPlaceholderText("Nama WI")
+        self.date_filter = QLineEdit()
+        self.date_filter.setPlaceholderText("Tgl (dd-mm-yyyy, mm-yyyy, yyyy)")
+        self.text_filter = QLineEdit()
+        self.text_filter.setPlaceholderText("Cari Pelatihan/Agenda/WI…")
+
+        for edit in (self.name_filter, self.date_filter, self.text_filter):
+            edit.setClearButtonEnabled(True)
+            edit.textChanged.connect(self.apply_filter)
+            bar.addWidget(edit)
+        return bar
+
+    def apply_filter(self):
+        date_text = self.date_filter.text().strip()
+        date_range = parse_date_range(date_text) if date_text else None
+        if date_text and date_range is None:
+            return  # Wait until the date is complete
+
+        self.proxy.set_filter(
+            name=self.name_filter.text(),
+            date_range=date_range,
+            text=self.text_filter.text(),
+        )
+
+    def show_cell(self, row, col=0):
+        """Select and scroll to a cell given in source model rows."""
+        if not 0 <= row < self.model.rowCount():
+            return
+
+        index = self.model.index(row, col)
+        view_model = self.table.model()
+        if view_model is not self.model:
+            if not view_model.mapFromSource(index).isValid():
+                for edit in (self.name_filter, self.date_filter, self.text_filter):
+                    edit.clear()
+            index = view_model.mapFromSource(index)
+
+        self.table.setCurrentIndex(index)
+        self.table.scrollTo(index, QTableView.PositionAtCenter)
+        self.table.setFocus()
+
+    def _source_row(self, row):
+        view_model = self.table.model()
+        if view_model is self.model:
+            return row
+        return view_model.mapToSource(view_model.index(row, 0)).row()
+
     def open_context_menu(self, pos):
         index = self.table.indexAt(pos)
         if not index.isValid():
             return
 
-        row = index.row()
-        model = self.table.model()
+        row = self._source_row(index.row())
+        model = self.model
 
         menu = QMenu(self)
 
         insert_before = menu.addAction("Insert row before")
         insert_after = menu.addAction("Insert row after")
+        paste_rows = menu.addAction("Paste rows after")
         delete_row = menu.addAction("Delete row")
 
         action = menu.exec_(self.table.viewport().mapToGlobal(pos))
@@ -74,59 +156,102 @@ class TablePage(QWidget):
         elif action == insert_after:
             model.insertRows(row + 1)
 
-        elif action == delete_row:
-            selected_len = len(self.table.selectionModel().selectedIndexes())
-            has_multiple = selected_len > 1
-            if has_multiple:
-                self.removeSelectedRows()
-            else:
-                model.removeRows(row)
+        elif action == paste_rows:
+            self.paste_rows(row + 1)
 
-            if len(model._data) == 0:
-                model.insertRows(row)
+        elif action == delete_row:
+            with self._edit("Delete rows"):
+                selected_len = len(self.table.selectionModel().selectedIndexes())
+                has_multiple = selected_len > 1
+                if has_multiple:
+                    self.removeSelectedRows()
+                else:
+                    model.removeRows(row)
+
+                if len(model._data) == 0:
+                    model.insertRows(row)
+
+    def _edit(self, text):
+        # One undo step and one derived-model update for the whole block
+        if self.history:
+            return self.history.macro(text)
+        return self.batcher.batch() if self.batcher else nullcontext()
 
     def removeSelectedRows(self):
         selection = self.table.selectionModel().selectedIndexes()
         if not selection:
             return
 
-        model = self.table.model()
-
-        source_model = model
+        source_model = self.model
         rows = sorted(
-            {i.row() for i in selection},
+            {self._source_row(i.row()) for i in selection},
             reverse=True
         )
 
+        # Group into contiguous (start, count) ranges, bottom range first so
+        # earlier ranges keep their row numbers
+        ranges = []
         for row in rows:
-            source_model.removeRows(row)
+            if ranges and ranges[-1][0] == row + 1:
+                ranges[-1][0] = row
+                ranges[-1][1] += 1
+            else:
+                ranges.append([row, 1])
+
+        with self._edit("Delete rows"):
+            for start, count in ranges:
+                source_model.removeRows(start, count)
+
+    def paste_rows(self, row=None):
+        text = QGuiApplication.clipboard().text()
+        records = self.parse_records(text)
+        if not records:
+            return
+
+        model = self.model
+        if row is None:
+            current = self.table.currentIndex()
+            row = self._source_row(current.row()) + 1 if current.isValid() else model.rowCount()
+
+        with self._edit("Paste rows"):
+            model.insert_records(row, records)
+
+    @staticmethod
+    def parse_records(text):
+        # Spreadsheets copy cells as TSV; fall back to CSV for plain text
+        text = text.strip("\r\n")
+        if not text:
+            return []
+
+        delimiter = "\t" if "\t" in text else ","
+        return [
+            [value.strip() for value in values]
+            for values in csv.reader(io.StringIO(text), delimiter=delimiter)
+            if any(value.strip() for value in values)
+        ]
 
 
 class WIDelegate(QStyledItemDelegate):
     def __init__(self, parent, wi_model):
         super().__init__(parent)
         self.wi_model = wi_model
+        # Shared by every editor; sorted by JP load as WI totals change
+        self.completions = WICompletionModel(wi_model, self) if wi_model else None
 
     def createEditor(self, parent, option, index):
         editor = QComboBox(parent)
         editor.setEditable(True)
         editor.setInsertPolicy(QComboBox.NoInsert)
 
-        if self.wi_model:
-            data_list = []
-            for row in range(self.wi_model.rowCount()):
-                nama = self.wi_model.data(self.wi_model.index(row, 0))
-                jp = self.wi_model.data(self.wi_model.index(row, 1))
-                data_list.append((nama, jp))
-
-            # Sort by JP (the second element in the tuple)
-            data_list.sort(key=lambda x: x[1])
-
-            items = [f"{nama} - {jp}" for nama, jp in data_list]
+        if self.completions is not None:
+            if hasattr(index.model(), "mapToSource"):
+                index = index.model().mapToSource(index)
+            model = index.model()
+            self.completions.set_context(model, model.schedule_row(index.row()))
 
-            completer = QCompleter(items, parent)
+            completer = QCompleter(self.completions, editor)
             completer.setCaseSensitivity(Qt.CaseInsensitive)
-            editor.addItems(items)
+            editor.setModel(self.completions)
             editor.setCompleter(completer)
 
         return editor
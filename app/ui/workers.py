@@ -0,0 +1,115 @@
+from qtpy.QtCore import QObject, QRunnable, QThreadPool, QEventLoop, Qt, Signal
+from qtpy.QtWidgets import QProgressDialog
+
+
+class WorkerSignals(QObject):
+    progress = Signal(int, int)
+    finished = Signal(object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+
+class Worker(QRunnable):
+    """Runs `fn(*args, progress=..., is_cancelled=..., **kwargs)` on a
+    QThreadPool thread.
+
+    Results and errors come back through `signals`, which are delivered on
+    the GUI thread, so slots may touch models and widgets.
+    """
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    def run(self):
+        try:
+            result = self.fn(
+                *self.args,
+                progress=self.signals.progress.emit,
+                is_cancelled=self.is_cancelled,
+                **self.kwargs
+            )
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            if self._cancelled:
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
+
+
+class IOService(QObject):
+    """Runs one file operation at a time off the GUI thread.
+
+    A window-modal progress dialog with a Cancel button is shown while it
+    runs; the rest of the window keeps repainting.
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._worker = None
+        self._dialog = None
+        self._running = False
+
+    def is_busy(self):
+        return self._running
+
+    def run(self, label, fn, *args, on_finished=None, on_failed=None, wait=False):
+        if self.is_busy():
+            return False
+
+        self._dialog = QProgressDialog(label, "Cancel", 0, 0, self.parent())
+        self._dialog.setWindowModality(Qt.WindowModal)
+        self._dialog.setMinimumDuration(300)
+        self._dialog.setAutoClose(False)
+        self._dialog.setAutoReset(False)
+
+        self._running = True
+        self._worker = Worker(fn, *args)
+        self._dialog.canceled.connect(self._worker.cancel)
+        self._worker.signals.progress.connect(self._on_progress)
+        self._worker.signals.finished.connect(self._done)
+        self._worker.signals.failed.connect(self._done)
+        self._worker.signals.cancelled.connect(self._done)
+        if on_finished:
+            self._worker.signals.finished.connect(on_finished)
+        if on_failed:
+            self._worker.signals.failed.connect(on_failed)
+
+        loop = None
+        if wait:
+            loop = QEventLoop()
+            self._worker.signals.finished.connect(loop.quit)
+            self._worker.signals.failed.connect(loop.quit)
+            self._worker.signals.cancelled.connect(loop.quit)
+
+        self.pool.start(self._worker)
+        if loop is not None:
+            loop.exec()
+        return True
+
+    def _on_progress(self, done, total):
+        if self._dialog is not None:
+            self._dialog.setMaximum(total)
+            self._dialog.setValue(done)
+
+    def _done(self, *args):
+        if self._dialog is not None:
+            self._dialog.close()
+            self._dialog.deleteLater()
+        self._dialog = None
+        self._running = False
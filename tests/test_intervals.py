@@ -0,0 +1,33 @@
+from app.domain.intervals import IntervalIndex
+from app.domain.schedule import Schedule
+from app.domain.schema import ScheduleRow
+
+
+def make_row(name, date, start, jp):
+    return ScheduleRow.from_list([date, start, jp, "", "Pelatihan", "Agenda", name], 45)
+
+
+def test_zero_length_first_session():
+    # A JP 0 session used to leave its bucket without a longest-session bound
+    schedule = Schedule([make_row("Yeli", "01-01-2026", "08:00", "0")])
+    row = make_row("Yeli", "01-01-2026", "08:00", "2")
+    assert schedule.find_clash(row.name, row.date, row.start, row.jp) is None
+
+    schedule.rows.append(row)
+    schedule.index_interval(row)
+    assert schedule.find_clashes() == []
+
+    for row in list(schedule.rows):
+        schedule.intervals.discard(row)
+    assert len(schedule.intervals) == 0
+
+
+def test_overlap_past_longest_bound():
+    index = IntervalIndex()
+    rows = [object() for _ in range(3)]
+    index.add(rows[0], ("A", 1), 0, 300)
+    index.add(rows[1], ("A", 1), 100, 130)
+    index.add(rows[2], ("A", 1), 200, 230)
+    assert index.find_overlap(("A", 1), 250, 260) is rows[0]
+    assert index.find_overlap(("A", 1), 300, 360) is None
+    assert len(index.find_clashes()) == 2